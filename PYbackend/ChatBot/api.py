@@ -1,31 +1,32 @@
+import time
+_import_start = time.perf_counter()
+
 import os
+import sys
+# PYbackend/ holds the modules the three services share (common/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import asyncio
 import logging
+from collections import deque
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 from fastapi.middleware.cors import CORSMiddleware
 from typing import List
-from langchain_groq import ChatGroq
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain_core.documents import Document
-from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.chains.combine_documents import create_stuff_documents_chain
 from langchain_core.prompts import ChatPromptTemplate
 from langchain.chains import create_retrieval_chain
-from langchain_community.vectorstores import FAISS
 from dotenv import load_dotenv
+from vector_index import IndexManager
+from embedding_service import CachedEmbeddings, create_base_embeddings
+from llm_client import ConnectionStats, create_http_clients, create_llm
+from common.model_loader import ModelLoader
+from common.tracing import render_metrics, trace_requests
 
-import logging
-from typing import List
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain_community.vectorstores import Chroma
-from langchain_groq import ChatGroq
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
-import os
-from fastapi.middleware.cors import CORSMiddleware
+# Time spent importing torch/langchain/faiss, reported in the startup profile
+IMPORT_SECONDS = time.perf_counter() - _import_start
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -40,7 +41,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "OPTIONS"],  # Explicitly allow OPTIONS
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
+# Stage timings of every request go to /metrics and to its Server-Timing header
+app.middleware("http")(trace_requests)
 # Load environment variables
 load_dotenv()
 groq_api_key = os.getenv("GROQ_API_KEY")
@@ -51,9 +55,12 @@ if not groq_api_key:
 # Define request models
 class SummariesRequest(BaseModel):
     summaries: List[str]
+    replace: bool = True  # drop indexed summaries that are not part of this upload
+    session_id: str = "default"  # each session/user gets its own index
 
 class QueryRequest(BaseModel):
     query: str
+    session_id: str = "default"
 
 # Define response model
 class QueryResponse(BaseModel):
@@ -62,65 +69,86 @@ class QueryResponse(BaseModel):
 
 # Global variables for RAG pipeline
 embeddings = None
-vector_store = None
-retrieval_chain = None
+index_manager = None
+# Built once at startup and shared by every session's retrieval chain
+llm = None
+document_chain = None
+http_clients = ()
+connection_stats = ConnectionStats()
+upload_latencies = deque(maxlen=1000)
+
+PROMPT = ChatPromptTemplate.from_template(
+    """
+    Answer the question based on the provided context only, which consists of user-generated summaries.
+    Provide the most accurate response based on the question.
+    Context: {context}
+    Question: {input}
+    Answer:
+    """
+)
+
+def build_retrieval_chain(retriever):
+    # Only the retriever is per session; the LLM client, prompt and document chain are shared
+    return create_retrieval_chain(retriever, document_chain)
+
+def load_llm():
+    global llm, document_chain, http_clients
+    # One pooled HTTP client pair, so queries reuse kept-alive connections to the LLM API
+    http_clients = create_http_clients(connection_stats)
+    llm = create_llm(groq_api_key, *http_clients)
+    document_chain = create_stuff_documents_chain(llm, PROMPT)
+
+def load_embeddings():
+    global embeddings, index_manager
+    # Batched + cached (LRU and on-disk) wrapper around all-MiniLM-L6-v2. CHATBOT_EMBEDDING_MODEL may be
+    # a local snapshot (python -m common.model_loader <model id> <dir>); with HF_HUB_OFFLINE=1 nothing is downloaded
+    embeddings = CachedEmbeddings(create_base_embeddings())
+    # Per-session indexes are loaded from disk on demand and evicted when idle
+    index_manager = IndexManager(embeddings, build_retrieval_chain)
+
+def warm_up_embeddings():
+    # Straight to the model so the warm-up text does not land in the cache
+    embeddings.base.embed_documents(["Warm up the embedding model before the first upload."])
+
+model_loader = ModelLoader("chatbot")
+model_loader.profile["import_seconds"] = IMPORT_SECONDS
+model_loader.add_step("llm", load_llm)
+model_loader.add_step("load", load_embeddings)
+model_loader.add_step("warm_up", warm_up_embeddings)
+
+def require_ready():
+    if not model_loader.ready:
+        raise HTTPException(status_code=503, detail=f"Embeddings are {model_loader.state}, retry shortly",
+                            headers={"Retry-After": "5"})
 
 @app.on_event("startup")
 async def startup_event():
-    global embeddings
-    try:
-        logger.info("Initializing embeddings...")
-        embeddings = HuggingFaceEmbeddings(
-            model_name="sentence-transformers/all-MiniLM-L6-v2",
-            encode_kwargs={'normalize_embeddings': True}
-        )
-        logger.info("Embeddings initialized successfully")
-    except Exception as e:
-        logger.error(f"Failed to initialize embeddings: {e}")
-        raise RuntimeError(f"Initialization failed: {e}")
+    # Models load in the background so the service accepts connections right away; see /health/ready
+    model_loader.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if http_clients:
+        http_clients[0].close()
+        await http_clients[1].aclose()
 
 @app.post("/summaries")
 async def store_summaries(request: SummariesRequest):
-    global vector_store, retrieval_chain
+    require_ready()
     try:
-        logger.info(f"Received {len(request.summaries)} summaries")
-        # Convert summaries to LangChain Documents
-        documents = [
-            Document(
-                page_content=summary,
-                metadata={"index": i}  # Minimal metadata to identify chunks
-            )
-            for i, summary in enumerate(request.summaries)
-        ]
-        
-        # Split documents
-        text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
-        final_docs = text_splitter.split_documents(documents)
-        
-        # Create or update FAISS vector store
-        vector_store = FAISS.from_documents(final_docs, embeddings)
-        
-        # Initialize LLM
-        llm = ChatGroq(model="gemma2-9b-it", api_key=groq_api_key, temperature=0.1, max_tokens=1000)
-        
-        # Define prompt template
-        prompt = ChatPromptTemplate.from_template(
-            """
-            Answer the question based on the provided context only, which consists of user-generated summaries.
-            Provide the most accurate response based on the question.
-            Context: {context}
-            Question: {input}
-            Answer:
-            """
+        logger.info(f"Received {len(request.summaries)} summaries for session {request.session_id}")
+        start = time.perf_counter()
+        # Embed only summaries the index has not seen; unchanged ones are skipped by content hash.
+        # Runs in a worker thread so queries keep being served while the upload is embedded.
+        stats = await asyncio.to_thread(
+            index_manager.sync, request.session_id, request.summaries, request.replace
         )
-        
-        # Create chains
-        document_chain = create_stuff_documents_chain(llm, prompt)
-        retriever = vector_store.as_retriever()
-        retrieval_chain = create_retrieval_chain(retriever, document_chain)
+        elapsed = time.perf_counter() - start
+        upload_latencies.append(elapsed)
+        logger.info(f"Vector index sync in {elapsed:.3f}s: {stats}")
         
         logger.info("Summaries processed and vector store updated")
-        return {"message": f"Successfully stored {len(request.summaries)} summaries"}
+        return {"message": f"Successfully stored {len(request.summaries)} summaries", "index": stats}
     except Exception as e:
         logger.error(f"Error processing summaries: {e}")
         if "Invalid token" in str(e) or "Invalid signature" in str(e):
@@ -129,21 +157,17 @@ async def store_summaries(request: SummariesRequest):
 
 @app.post("/query", response_model=QueryResponse)
 async def query_rag(request: QueryRequest):
+    require_ready()
+    retrieval_chain = index_manager.retrieval_chain(request.session_id)
     if not retrieval_chain:
         logger.error("RAG pipeline not initialized. Please store summaries first.")
         raise HTTPException(status_code=400, detail="No summaries stored. Please use /summaries endpoint first.")
     
     try:
         logger.info(f"Processing query: {request.query}")
-        response = retrieval_chain.invoke({"input": request.query})
-        # Simplify context for API response
-        context = [
-            {
-                "content": doc.page_content[:600],
-                "metadata": {"index": doc.metadata.get("index")}
-            }
-            for doc in response["context"]
-        ]
+        # Async invoke: the question embedding is micro-batched with concurrent queries
+        response = await retrieval_chain.ainvoke({"input": request.query})
+        context = simplify_context(response["context"])
         logger.info(f"Query processed successfully")
         return QueryResponse(answer=response["answer"], context=context)
     except Exception as e:
@@ -152,6 +176,96 @@ async def query_rag(request: QueryRequest):
             raise HTTPException(status_code=401, detail="Session expired, please log in again")
         raise HTTPException(status_code=500, detail=f"Error processing query: {e}")
 
+def simplify_context(docs) -> List[dict]:
+    # Simplify context for API response
+    return [
+        {
+            "content": doc.page_content[:600],
+            "metadata": {"index": doc.metadata.get("index")}
+        }
+        for doc in docs
+    ]
+
+@app.post("/query/stream")
+async def query_rag_stream(request: QueryRequest):
+    """Stream the retrieved context first, then answer tokens as the LLM produces them (NDJSON)."""
+    require_ready()
+    retrieval_chain = index_manager.retrieval_chain(request.session_id)
+    if not retrieval_chain:
+        logger.error("RAG pipeline not initialized. Please store summaries first.")
+        raise HTTPException(status_code=400, detail="No summaries stored. Please use /summaries endpoint first.")
+
+    async def events():
+        start = time.perf_counter()
+        time_to_first_token = None
+        answer = []
+        try:
+            logger.info(f"Streaming query: {request.query}")
+            async for chunk in retrieval_chain.astream({"input": request.query}):
+                if "context" in chunk:
+                    yield json.dumps({"type": "context", "context": simplify_context(chunk["context"])}) + "\n"
+                if chunk.get("answer"):
+                    if time_to_first_token is None:
+                        time_to_first_token = time.perf_counter() - start
+                    answer.append(chunk["answer"])
+                    yield json.dumps({"type": "token", "text": chunk["answer"]}) + "\n"
+            yield json.dumps({
+                "type": "done",
+                "answer": "".join(answer),
+                "time_to_first_token": time_to_first_token,
+                "total_time": time.perf_counter() - start
+            }) + "\n"
+        except Exception as e:
+            # Headers are already sent, so errors are reported in-band
+            logger.error(f"Error streaming query: {e}")
+            yield json.dumps({"type": "error", "detail": f"Error processing query: {e}"}) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+@app.get("/health/live")
+async def health_live():
+    # The process is up and serving; model loading may still be in progress
+    return {"status": "alive", "state": model_loader.state}
+
+@app.get("/health/ready")
+async def health_ready():
+    status = model_loader.status()
+    return JSONResponse(status_code=200 if model_loader.ready else 503, content=status)
+
+@app.get("/metrics")
+async def metrics():
+    # Prometheus text format: per-stage and per-route latency histograms
+    return PlainTextResponse(render_metrics("chatbot"), media_type="text/plain; version=0.0.4")
+
+@app.get("/embeddings/stats")
+async def embedding_stats():
+    require_ready()
+    return embeddings.metrics()
+
+@app.get("/pipeline/stats")
+async def pipeline_stats():
+    latencies = sorted(upload_latencies)
+    return {
+        "startup": model_loader.profile,
+        "uploads": {
+            "count": len(latencies),
+            "p50_seconds": percentile(latencies, 50),
+            "p95_seconds": percentile(latencies, 95),
+            "max_seconds": latencies[-1] if latencies else 0.0,
+        },
+        "llm_connections": connection_stats.metrics(),
+    }
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+@app.get("/sessions/stats")
+async def session_stats():
+    require_ready()
+    return index_manager.status()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8002)
\ No newline at end of file
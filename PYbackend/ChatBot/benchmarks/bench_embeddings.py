@@ -0,0 +1,99 @@
+"""Embeddings/sec and cache hit rate of the chatbot's embedding layer.
+
+Runs four phases against the same model:
+  1. the bare model, one text per call (what per-question embedding costs)
+  2. CachedEmbeddings on a cold cache (batched)
+  3. the same corpus again (warm cache)
+  4. ``--queries`` concurrent embed_query calls (micro-batched)
+
+    cd PYbackend/ChatBot
+    python benchmarks/bench_embeddings.py                          # all-MiniLM-L6-v2, torch backend
+    python benchmarks/bench_embeddings.py --backend onnx --onnx-file onnx/model_qint8_avx2.onnx
+    python benchmarks/bench_embeddings.py --stub                   # offline, simulated model cost
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.embeddings import Embeddings
+from embedding_service import CachedEmbeddings, create_base_embeddings
+
+TOPICS = ["asyncio", "caching", "vector search", "web scraping", "summarization", "text to speech",
+          "connection pooling", "batching", "profiling", "load testing"]
+
+
+def make_corpus(n, seed=7):
+    rng = random.Random(seed)
+    return [
+        f"Summary {i}: {rng.choice(TOPICS)} matters because {rng.choice(TOPICS)} "
+        f"and {rng.choice(TOPICS)} interact under load, so measure before optimizing."
+        for i in range(n)
+    ]
+
+
+class StubEmbeddings(Embeddings):
+    """Simulated model: fixed cost per call plus a smaller cost per text."""
+
+    def __init__(self, overhead=0.01, per_text=0.001, size=384):
+        self.overhead, self.per_text, self.size = overhead, per_text, size
+
+    def embed_documents(self, texts):
+        time.sleep(self.overhead + self.per_text * len(texts))
+        return [[(hash(t) % 1000) / 1000.0] * self.size for t in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def timed(label, n, fn):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {n:>7} {n / elapsed:>12.1f} {elapsed:>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--texts", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--backend", default="torch", choices=["torch", "onnx", "openvino"])
+    parser.add_argument("--onnx-file", default="")
+    parser.add_argument("--stub", action="store_true")
+    args = parser.parse_args()
+
+    base = StubEmbeddings() if args.stub else create_base_embeddings(backend=args.backend, onnx_file=args.onnx_file)
+    corpus = make_corpus(args.texts)
+    base.embed_documents(corpus[:8])  # warm-up
+
+    print(f"{'phase':<28} {'texts':>7} {'emb/s':>12} {'seconds':>9}")
+    single = corpus[:min(len(corpus), 200)]
+    timed("bare model, 1 per call", len(single), lambda: [base.embed_documents([t]) for t in single])
+
+    cached = CachedEmbeddings(base, batch_size=args.batch_size, db_path="")
+    timed("cached, cold", len(corpus), lambda: cached.embed_documents(corpus))
+    timed("cached, warm", len(corpus), lambda: cached.embed_documents(corpus))
+
+    queries = [f"What does {TOPICS[i % len(TOPICS)]} have to do with question {i}?" for i in range(args.queries)]
+
+    def ask_all():
+        threads = [threading.Thread(target=cached.embed_query, args=(q,)) for q in queries]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    timed("concurrent queries", len(queries), ask_all)
+
+    metrics = cached.metrics()
+    batches = metrics["query_batches"] or 1
+    print(f"cache hit rate {metrics['hit_rate']:.1%}, {metrics['model_calls']} model calls, "
+          f"{metrics['queries_batched'] / batches:.1f} queries per micro-batch")
+
+
+if __name__ == "__main__":
+    main()
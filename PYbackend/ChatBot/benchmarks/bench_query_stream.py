@@ -0,0 +1,146 @@
+"""Check that streamed /query/stream requests overlap instead of queueing on the event loop.
+
+Serves the ChatBot app with uvicorn on a local port (an in-memory ASGI
+transport would buffer each body, so every token would seem to arrive at the
+end), with a local stand-in LLM (fixed delay per token, no network) and
+stand-in embeddings. Uploads a few summaries, then fires ``--concurrency``
+streaming queries at once. Reports time-to-first-token and total time, and
+exits with status 1 if the queries ran serially or their tokens did not
+arrive until the end of the response.
+
+    cd PYbackend/ChatBot
+    python benchmarks/bench_query_stream.py --concurrency 8
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+from typing import Any, AsyncIterator, Iterator, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# PYbackend/, for the modules the services share (common/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault("GROQ_API_KEY", "stand-in")
+os.environ["CHATBOT_INDEX_DIR"] = tempfile.mkdtemp(prefix="chatbot-bench-")
+os.environ["CHATBOT_EMBEDDING_CACHE_DB"] = ""
+
+import httpx
+import uvicorn
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+import api
+
+ANSWER = "Batching and caching both trade a little latency for a lot of throughput under load ."
+
+
+class StandInLLM(BaseChatModel):
+    """Local chat model that streams a canned answer with a fixed delay per token."""
+    token_delay: float = 0.02
+
+    @property
+    def _llm_type(self) -> str:
+        return "stand-in"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        time.sleep(self.token_delay * len(ANSWER.split()))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=ANSWER))])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        for token in ANSWER.split():
+            time.sleep(self.token_delay)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token + " "))
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        for token in ANSWER.split():
+            await asyncio.sleep(self.token_delay)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token + " "))
+
+
+def install_stand_ins(token_delay):
+    api.create_base_embeddings = lambda: DeterministicFakeEmbedding(size=64)
+    api.create_llm = lambda *args, **kwargs: StandInLLM(token_delay=token_delay)
+
+
+async def stream_query(client, query, session_id):
+    start = time.perf_counter()
+    first_token = None
+    events: List[dict] = []
+    async with client.stream("POST", "/query/stream", json={"query": query, "session_id": session_id}) as response:
+        async for line in response.aiter_lines():
+            if not line:
+                continue
+            event = json.loads(line)
+            events.append(event)
+            if event["type"] == "token" and first_token is None:
+                first_token = time.perf_counter() - start
+    assert events[0]["type"] == "context", events[0]
+    assert events[-1]["type"] == "done", events[-1]
+    return first_token, time.perf_counter() - start
+
+
+async def serve(app):
+    """Run ``app`` under uvicorn on a free local port, in this event loop."""
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        if serving.done():
+            serving.result()  # raises why the server did not start
+        await asyncio.sleep(0.05)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    return server, serving, f"http://127.0.0.1:{port}"
+
+
+async def run(concurrency, token_delay) -> Optional[bool]:
+    install_stand_ins(token_delay)
+    server, serving, url = await serve(api.app)
+    try:
+        return await measure(url, concurrency)
+    finally:
+        server.should_exit = True
+        await serving
+
+
+async def measure(url, concurrency) -> bool:
+    if not await asyncio.to_thread(api.model_loader.wait, 60):
+        raise RuntimeError(f"ChatBot failed to start: {api.model_loader.status()}")
+    async with httpx.AsyncClient(base_url=url, timeout=120) as client:
+        summaries = [f"Summary {i}: caching and batching improve throughput. " * 3 for i in range(20)]
+        response = await client.post("/summaries", json={"summaries": summaries, "session_id": "bench"})
+        response.raise_for_status()
+
+        single_first, single_total = await stream_query(client, "warm up", "bench")
+        start = time.perf_counter()
+        results = await asyncio.gather(*[
+            stream_query(client, f"question {i}", "bench") for i in range(concurrency)
+        ])
+        wall = time.perf_counter() - start
+
+    first_tokens = sorted(r[0] for r in results)
+    print(f"single query: first token {single_first * 1000:.0f} ms, total {single_total * 1000:.0f} ms")
+    print(f"{concurrency} concurrent: wall {wall * 1000:.0f} ms, "
+          f"median first token {first_tokens[len(first_tokens) // 2] * 1000:.0f} ms, "
+          f"serial estimate {single_total * concurrency * 1000:.0f} ms")
+    overlapped = wall < single_total * concurrency * 0.5
+    print("queries overlapped" if overlapped else "queries ran serially: the event loop is blocked")
+    # A buffered response delivers its first token together with the last one
+    streamed = all(first < total * 0.5 for first, total in results + [(single_first, single_total)])
+    print("tokens streamed" if streamed else "first token arrived with the last: the response was buffered")
+    return overlapped and streamed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--token-delay", type=float, default=0.02, help="stand-in LLM seconds per token")
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(run(args.concurrency, args.token_delay)) else 1)
+
+
+if __name__ == "__main__":
+    main()
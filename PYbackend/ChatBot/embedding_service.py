@@ -0,0 +1,235 @@
+import os
+import time
+import asyncio
+import hashlib
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from typing import List
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_community.embeddings import HuggingFaceEmbeddings
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = os.getenv("CHATBOT_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+# "torch" (default), "onnx" or "openvino"; the latter two need sentence-transformers>=3.2 and optimum
+EMBEDDING_BACKEND = os.getenv("CHATBOT_EMBEDDING_BACKEND", "torch")
+# ONNX file inside the model repo, e.g. "onnx/model_qint8_avx2.onnx" for the int8-quantized export
+EMBEDDING_ONNX_FILE = os.getenv("CHATBOT_EMBEDDING_ONNX_FILE", "")
+EMBEDDING_BATCH_SIZE = int(os.getenv("CHATBOT_EMBEDDING_BATCH_SIZE", "64"))
+EMBEDDING_CACHE_SIZE = int(os.getenv("CHATBOT_EMBEDDING_CACHE_SIZE", "50000"))
+EMBEDDING_CACHE_DB = os.getenv("CHATBOT_EMBEDDING_CACHE_DB", "embedding_cache.sqlite3")  # empty = memory only
+QUERY_BATCH_WAIT_MS = float(os.getenv("CHATBOT_QUERY_BATCH_WAIT_MS", "5"))
+
+
+def embedding_model_id(model_name=EMBEDDING_MODEL, backend=EMBEDDING_BACKEND, onnx_file=EMBEDDING_ONNX_FILE) -> str:
+    """Identity of the vectors a configuration produces; backends differ slightly, so the cache keys on it."""
+    if backend == "torch":
+        return model_name
+    return f"{model_name}#{backend}" + (f":{onnx_file}" if onnx_file else "")
+
+
+def create_base_embeddings(model_name=EMBEDDING_MODEL, backend=EMBEDDING_BACKEND, onnx_file=EMBEDDING_ONNX_FILE):
+    """HuggingFace sentence embeddings on the configured CPU backend."""
+    model_kwargs = {}
+    if backend != "torch":
+        model_kwargs["backend"] = backend
+        if onnx_file:
+            model_kwargs["model_kwargs"] = {"file_name": onnx_file}
+    return HuggingFaceEmbeddings(
+        model_name=model_name,
+        model_kwargs=model_kwargs,
+        encode_kwargs={'normalize_embeddings': True, 'batch_size': EMBEDDING_BATCH_SIZE}
+    )
+
+
+class CachedEmbeddings(Embeddings):
+    """Batched, cached wrapper around an Embeddings model.
+
+    Vectors are cached by a hash of (model id, text) in an LRU and, optionally, in
+    a SQLite table so they survive restarts. Documents are embedded in
+    ``batch_size`` batches, duplicates within a call are embedded once, and
+    concurrent ``aembed_query``/``embed_query`` calls are micro-batched into a
+    single model call. Queries and documents share the cache, which assumes
+    the model embeds both the same way (true for sentence-transformers models
+    without instruction prefixes such as all-MiniLM-L6-v2).
+    """
+
+    def __init__(self, base: Embeddings, model_name=EMBEDDING_MODEL, batch_size=EMBEDDING_BATCH_SIZE,
+                 cache_size=EMBEDDING_CACHE_SIZE, db_path=EMBEDDING_CACHE_DB, query_wait_ms=QUERY_BATCH_WAIT_MS,
+                 backend=EMBEDDING_BACKEND, onnx_file=EMBEDDING_ONNX_FILE):
+        self.base = base
+        self.model_name = model_name
+        # Vectors from another backend or ONNX export must not land in the same index
+        self.model_id = embedding_model_id(model_name, backend, onnx_file)
+        self.batch_size = max(1, batch_size)
+        self.cache_size = cache_size
+        self.query_wait = query_wait_ms / 1000
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._model_lock = threading.Lock()
+        self._queries = deque()
+        self._query_cond = threading.Condition()
+        self._query_worker = None
+        self._db = None
+        self.stats = {"hits": 0, "misses": 0, "disk_hits": 0, "embedded": 0, "model_calls": 0,
+                      "query_batches": 0, "queries_batched": 0, "embed_seconds": 0.0}
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB)")
+            self._db.commit()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [self._key(text) for text in texts]
+        vectors = self._lookup(keys)
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors:
+                missing.setdefault(key, text)
+        if missing:
+            items = list(missing.items())
+            for i in range(0, len(items), self.batch_size):
+                batch = items[i:i + self.batch_size]
+                embedded = self._embed([text for _, text in batch])
+                self._store([key for key, _ in batch], embedded)
+                vectors.update(zip((key for key, _ in batch), embedded))
+        return [vectors[key].tolist() for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.submit_query(text).result()
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await asyncio.to_thread(self.embed_documents, texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return await asyncio.wrap_future(self.submit_query(text))
+
+    def submit_query(self, text: str) -> Future:
+        """Embed a query, joining whatever other queries arrive within the micro-batch window."""
+        future = Future()
+        key = self._key(text)
+        cached = self._lookup([key])
+        if key in cached:
+            future.set_result(cached[key].tolist())
+            return future
+        with self._query_cond:
+            if self._query_worker is None:
+                self._query_worker = threading.Thread(target=self._run_queries, name="query-embedder", daemon=True)
+                self._query_worker.start()
+            self._queries.append((key, text, future, time.perf_counter()))
+            self._query_cond.notify()
+        return future
+
+    def metrics(self):
+        with self._lock:
+            stats = dict(self.stats)
+            entries = len(self._cache)
+        lookups = stats["hits"] + stats["misses"]
+        return {
+            **stats,
+            "entries": entries,
+            "max_entries": self.cache_size,
+            "hit_rate": stats["hits"] / lookups if lookups else 0.0,
+            "embeddings_per_second": stats["embedded"] / stats["embed_seconds"] if stats["embed_seconds"] else 0.0,
+            "persistent": self._db is not None,
+        }
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_id}\x00{text}".encode("utf-8")).hexdigest()
+
+    def _embed(self, texts: List[str]) -> List[np.ndarray]:
+        # One model call at a time: the model already uses every core for a batch
+        with self._model_lock:
+            start = time.perf_counter()
+            result = self.base.embed_documents(texts)
+            elapsed = time.perf_counter() - start
+        with self._lock:
+            self.stats["embedded"] += len(texts)
+            self.stats["model_calls"] += 1
+            self.stats["embed_seconds"] += elapsed
+        return [np.asarray(vector, dtype=np.float32) for vector in result]
+
+    def _lookup(self, keys: List[str]) -> dict:
+        found, missing = {}, []
+        with self._lock:
+            for key in keys:
+                vector = self._cache.get(key)
+                if vector is not None:
+                    self._cache.move_to_end(key)
+                    found[key] = vector
+                elif key not in found:
+                    missing.append(key)
+            if missing and self._db is not None:
+                unique = list(dict.fromkeys(missing))
+                for i in range(0, len(unique), 500):
+                    part = unique[i:i + 500]
+                    rows = self._db.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(part))})", part
+                    ).fetchall()
+                    for key, blob in rows:
+                        vector = np.frombuffer(blob, dtype=np.float32)
+                        found[key] = vector
+                        self._put(key, vector)
+                        self.stats["disk_hits"] += 1
+            hits = sum(1 for key in keys if key in found)
+            self.stats["hits"] += hits
+            self.stats["misses"] += len(keys) - hits
+        return found
+
+    def _store(self, keys: List[str], vectors: List[np.ndarray]):
+        with self._lock:
+            for key, vector in zip(keys, vectors):
+                self._put(key, vector)
+            if self._db is not None:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    [(key, vector.tobytes()) for key, vector in zip(keys, vectors)]
+                )
+                self._db.commit()
+
+    def _put(self, key, vector):
+        self._cache[key] = vector
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _run_queries(self):
+        while True:
+            with self._query_cond:
+                while not self._queries:
+                    self._query_cond.wait()
+                deadline = self._queries[0][3] + self.query_wait
+                while len(self._queries) < self.batch_size:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._query_cond.wait(remaining)
+                batch = [self._queries.popleft() for _ in range(min(self.batch_size, len(self._queries)))]
+            unique = {}
+            for key, text, _, _ in batch:
+                unique.setdefault(key, text)
+            # This thread serves every query, so nothing may raise out of the loop
+            try:
+                vectors = self._embed(list(unique.values()))
+            except Exception as e:
+                for _, _, future, _ in batch:
+                    if future.set_running_or_notify_cancel():
+                        future.set_exception(e)
+                continue
+            try:
+                self._store(list(unique), vectors)
+            except Exception as e:
+                # e.g. a locked or full database: the vectors are still good, they just are not cached
+                logger.error(f"Could not cache {len(unique)} query embedding(s): {e}")
+            by_key = dict(zip(unique, vectors))
+            with self._lock:
+                self.stats["query_batches"] += 1
+                self.stats["queries_batched"] += len(batch)
+            for key, _, future, _ in batch:
+                # False when the caller stopped waiting (a cancelled aembed_query)
+                if future.set_running_or_notify_cancel():
+                    future.set_result(by_key[key].tolist())
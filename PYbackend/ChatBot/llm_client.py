@@ -0,0 +1,117 @@
+import os
+import time
+import logging
+import threading
+import httpx
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_groq import ChatGroq
+from common.tracing import record
+
+logger = logging.getLogger(__name__)
+
+LLM_MODEL = os.getenv("CHATBOT_LLM_MODEL", "gemma2-9b-it")
+LLM_MAX_CONNECTIONS = int(os.getenv("CHATBOT_LLM_MAX_CONNECTIONS", "20"))
+LLM_KEEPALIVE_SECONDS = float(os.getenv("CHATBOT_LLM_KEEPALIVE_SECONDS", "60"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("CHATBOT_LLM_TIMEOUT_SECONDS", "60"))
+
+
+class ConnectionStats:
+    """Counts LLM HTTP requests and the TCP connections opened for them.
+
+    httpcore reports every new connection through the request's ``trace``
+    extension, so ``requests - connections_opened`` requests reused a pooled
+    connection.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "connections_opened": 0}
+
+    def on_request(self, request: httpx.Request):
+        self._count("requests")
+        request.extensions["trace"] = self._trace
+
+    async def on_async_request(self, request: httpx.Request):
+        self._count("requests")
+        request.extensions["trace"] = self._async_trace
+
+    def metrics(self):
+        with self._lock:
+            stats = dict(self.stats)
+        reused = max(0, stats["requests"] - stats["connections_opened"])
+        return {
+            **stats,
+            "reused": reused,
+            "reuse_rate": reused / stats["requests"] if stats["requests"] else 0.0,
+        }
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _trace(self, event_name, info):
+        if event_name == "connection.connect_tcp.complete":
+            self._count("connections_opened")
+
+    async def _async_trace(self, event_name, info):
+        self._trace(event_name, info)
+
+
+def create_http_clients(stats: ConnectionStats):
+    """Sync and async httpx clients with a shared-size keep-alive pool for the LLM API."""
+    limits = httpx.Limits(
+        max_connections=LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=LLM_MAX_CONNECTIONS,
+        keepalive_expiry=LLM_KEEPALIVE_SECONDS,
+    )
+    timeout = httpx.Timeout(LLM_TIMEOUT_SECONDS, connect=10.0)
+    return (
+        httpx.Client(limits=limits, timeout=timeout, event_hooks={"request": [stats.on_request]}),
+        httpx.AsyncClient(limits=limits, timeout=timeout, event_hooks={"request": [stats.on_async_request]}),
+    )
+
+
+class LLMTimer(BaseCallbackHandler):
+    """Records each LLM call as the "llm" stage and its first streamed token as "llm_first_token"."""
+    run_inline = True  # called on the event loop, inside the request's context
+
+    def __init__(self):
+        self._starts = {}
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        with self._lock:
+            self._starts[run_id] = [time.perf_counter(), False]
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        with self._lock:
+            start = self._starts.get(run_id)
+            if start is None or start[1]:
+                return
+            start[1] = True
+        record("llm_first_token", time.perf_counter() - start[0])
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._finish(run_id)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id)
+
+    def _finish(self, run_id):
+        with self._lock:
+            start = self._starts.pop(run_id, None)
+        if start is not None:
+            record("llm", time.perf_counter() - start[0])
+
+
+def create_llm(api_key, http_client=None, http_async_client=None):
+    """The Groq chat model used for every query, on the given pooled HTTP clients."""
+    return ChatGroq(
+        model=LLM_MODEL,
+        api_key=api_key,
+        temperature=0.1,
+        max_tokens=1000,
+        http_client=http_client,
+        http_async_client=http_async_client,
+        callbacks=[LLMTimer()],
+    )
@@ -0,0 +1,354 @@
+import os
+import re
+import time
+import asyncio
+import pickle
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List
+import faiss
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_community.vectorstores import FAISS
+from common.tracing import record, span
+
+logger = logging.getLogger(__name__)
+
+INDEX_DIR = os.getenv("CHATBOT_INDEX_DIR", "vector_index")
+INDEX_MEMORY_MB = float(os.getenv("CHATBOT_INDEX_MEMORY_MB", "512"))
+SESSION_IDLE_SECONDS = float(os.getenv("CHATBOT_SESSION_IDLE_SECONDS", "1800"))
+
+
+def summary_hash(summary: str) -> str:
+    return hashlib.sha256(" ".join(summary.split()).encode("utf-8")).hexdigest()
+
+
+class IncrementalIndex:
+    """FAISS index of summaries that only embeds content it has not seen before.
+
+    Every split chunk is stored under the id ``<summary hash>:<n>``, so a
+    summary that is already indexed is skipped on re-upload and a summary that
+    disappeared from an upload can be removed without touching the others.
+    The index is written to ``path`` after each change and memory-mapped on
+    load; the first change after a load copies it into memory before appending.
+
+    New summaries are embedded before any lock readers use is taken, and the
+    vectors are then applied in one short critical section, so a query sees
+    the index either before or after a sync, never halfway through it.
+    """
+
+    def __init__(self, embeddings, path=INDEX_DIR, chunk_size=1000, chunk_overlap=200):
+        self.embeddings = embeddings
+        self.path = path
+        self.store = None
+        self._ids_by_hash: Dict[str, List[str]] = {}
+        self._mmapped = False
+        self._memory_bytes = 0
+        self._lock = threading.RLock()  # guards the store for readers
+        self._write_lock = threading.RLock()  # serializes sync/save
+        self.text_splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+    @property
+    def index_file(self):
+        return os.path.join(self.path, "index.faiss")
+
+    @property
+    def docstore_file(self):
+        return os.path.join(self.path, "index.pkl")
+
+    def __len__(self):
+        return len(self._ids_by_hash)
+
+    def load(self) -> bool:
+        """Load a previously saved index from disk; returns False when there is none."""
+        if not (os.path.exists(self.index_file) and os.path.exists(self.docstore_file)):
+            return False
+        with self._write_lock, self._lock:
+            try:
+                index = faiss.read_index(self.index_file, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+                self._mmapped = True
+            except RuntimeError:
+                # Not every index type supports mmap; fall back to reading it into memory
+                index = faiss.read_index(self.index_file)
+                self._mmapped = False
+            with open(self.docstore_file, "rb") as f:
+                docstore, index_to_docstore_id = pickle.load(f)
+            self.store = FAISS(self.embeddings, index, docstore, index_to_docstore_id)
+            self._ids_by_hash = {}
+            for doc_id in index_to_docstore_id.values():
+                self._ids_by_hash.setdefault(doc_id.split(":", 1)[0], []).append(doc_id)
+            self._measure()
+        logger.info(f"Loaded vector index with {len(self)} summaries from {self.path} (mmap={self._mmapped})")
+        return True
+
+    def sync(self, summaries: List[str], replace: bool = True) -> Dict:
+        """Make the index match ``summaries``, embedding only the ones that are new.
+
+        With ``replace`` summaries that are indexed but not in this upload are
+        removed; otherwise the upload is only appended.
+        """
+        with self._write_lock:
+            wanted = {}
+            for i, summary in enumerate(summaries):
+                wanted.setdefault(summary_hash(summary), (i, summary))
+
+            new_docs, new_ids, new_hashes, moved = [], [], {}, False
+            for content_hash, (i, summary) in wanted.items():
+                if content_hash in self._ids_by_hash:
+                    with self._lock:
+                        moved = self._set_position(content_hash, i) or moved
+                    continue
+                chunks = self.text_splitter.split_documents(
+                    [Document(page_content=summary, metadata={"index": i, "hash": content_hash})]
+                )
+                ids = [f"{content_hash}:{n}" for n in range(len(chunks))]
+                new_docs.extend(chunks)
+                new_ids.extend(ids)
+                new_hashes[content_hash] = ids
+
+            stale = [h for h in self._ids_by_hash if h not in wanted] if replace else []
+            stale_ids = [doc_id for h in stale for doc_id in self._ids_by_hash[h]]
+
+            # The slow part, embedding, happens while queries keep using the current index
+            start = time.perf_counter()
+            texts = [doc.page_content for doc in new_docs]
+            vectors = self.embeddings.embed_documents(texts) if new_docs else []
+            embed_seconds = time.perf_counter() - start
+            if new_docs:
+                record("embedding", embed_seconds)
+
+            start = time.perf_counter()
+            with self._lock:
+                if new_docs or stale_ids:
+                    self._thaw()
+                if new_docs:
+                    metadatas = [doc.metadata for doc in new_docs]
+                    if self.store is None:
+                        self.store = FAISS.from_embeddings(
+                            list(zip(texts, vectors)), self.embeddings, metadatas=metadatas, ids=new_ids
+                        )
+                    else:
+                        self.store.add_embeddings(list(zip(texts, vectors)), metadatas=metadatas, ids=new_ids)
+                    self._ids_by_hash.update(new_hashes)
+                if stale_ids:
+                    self.store.delete(stale_ids)
+                    for h in stale:
+                        del self._ids_by_hash[h]
+                if new_docs or stale_ids or moved:
+                    self._measure()
+            swap_seconds = time.perf_counter() - start
+            record("index_swap", swap_seconds)
+            if new_docs or stale_ids or moved:
+                self.save()
+
+            return {
+                "added": len(new_hashes),
+                "skipped": len(wanted) - len(new_hashes),
+                "removed": len(stale),
+                "embedded_chunks": len(new_docs),
+                "embed_seconds": embed_seconds,
+                "swap_seconds": swap_seconds,
+                "total": len(self),
+            }
+
+    def save(self):
+        """Write the index and docstore atomically so a crash never leaves a half-written index."""
+        with self._write_lock:
+            if self.store is None:
+                return
+            os.makedirs(self.path, exist_ok=True)
+            faiss.write_index(self.store.index, self.index_file + ".tmp")
+            with open(self.docstore_file + ".tmp", "wb") as f:
+                pickle.dump((self.store.docstore, self.store.index_to_docstore_id), f)
+            os.replace(self.index_file + ".tmp", self.index_file)
+            os.replace(self.docstore_file + ".tmp", self.docstore_file)
+
+    def memory_bytes(self) -> int:
+        """Rough resident size: the vectors plus the stored chunk text (refreshed on load and sync)."""
+        return self._memory_bytes
+
+    def _measure(self):
+        if self.store is None:
+            self._memory_bytes = 0
+            return
+        index = self.store.index
+        texts = sum(len(doc.page_content) + 64 for doc in self.store.docstore._dict.values())
+        self._memory_bytes = index.ntotal * index.d * 4 + texts
+
+    def search(self, vector, k=4) -> List[Document]:
+        with self._lock:
+            if self.store is None:
+                return []
+            with span("faiss_search"):
+                return self.store.similarity_search_by_vector(vector, k=k)
+
+    def as_retriever(self, k=4):
+        return IndexRetriever(index=self, k=k)
+
+    def _thaw(self):
+        # A memory-mapped index is read-only; copy it into memory before changing it
+        if self._mmapped and self.store is not None:
+            self.store.index = faiss.clone_index(self.store.index)
+            self._mmapped = False
+
+    def _set_position(self, content_hash, i):
+        # Unchanged summaries keep their vectors; only their position in the upload is refreshed
+        moved = False
+        for doc_id in self._ids_by_hash[content_hash]:
+            doc = self.store.docstore.search(doc_id)
+            if isinstance(doc, Document) and doc.metadata.get("index") != i:
+                doc.metadata["index"] = i
+                moved = True
+        return moved
+
+
+class IndexRetriever(BaseRetriever):
+    """Retriever bound to an IncrementalIndex rather than to one FAISS store.
+
+    Chains built on it never need rebuilding: every search goes to whatever
+    the index holds at that moment. The query is embedded without holding the
+    index lock, so only the vector search waits for a sync being applied.
+    """
+    index: Any
+    k: int = 4
+
+    def _get_relevant_documents(self, query: str, *, run_manager) -> List[Document]:
+        with span("embedding"):
+            vector = self.index.embeddings.embed_query(query)
+        return self.index.search(vector, self.k)
+
+    async def _aget_relevant_documents(self, query: str, *, run_manager) -> List[Document]:
+        with span("embedding"):
+            vector = await self.index.embeddings.aembed_query(query)
+        return await asyncio.to_thread(self.index.search, vector, self.k)
+
+
+class _Session:
+    __slots__ = ("index", "chain", "last_used", "syncing")
+
+    def __init__(self, index):
+        self.index = index
+        self.chain = None
+        self.syncing = 0
+        self.last_used = time.monotonic()
+
+
+class IndexManager:
+    """One IncrementalIndex per session/user, kept in memory within a budget.
+
+    Indexes are loaded from ``<base_path>/<session>`` on first use and their
+    retrieval chains are built once, lazily, by ``build_chain(retriever)``;
+    the retriever follows the index through later syncs. When the
+    loaded indexes exceed ``memory_budget_mb``, or an index has been idle for
+    ``idle_seconds``, the least recently used ones are evicted (they are
+    already on disk) and reloaded on the next request for that session.
+    """
+
+    def __init__(self, embeddings, build_chain: Callable, base_path=INDEX_DIR,
+                 memory_budget_mb=INDEX_MEMORY_MB, idle_seconds=SESSION_IDLE_SECONDS):
+        self.embeddings = embeddings
+        self.build_chain = build_chain
+        self.base_path = base_path
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self.idle_seconds = idle_seconds
+        self._sessions: "OrderedDict[str, _Session]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.stats = {"loads": 0, "evictions": 0, "created": 0}
+
+    def session_path(self, session_id: str) -> str:
+        safe = re.sub(r"[^A-Za-z0-9_-]", "_", session_id)[:64]
+        digest = hashlib.sha1(session_id.encode("utf-8")).hexdigest()[:8]
+        return os.path.join(self.base_path, f"{safe}-{digest}")
+
+    def index(self, session_id: str, create: bool = False):
+        """The session's index, loading it from disk if needed; None if it does not exist."""
+        with self._lock:
+            session = self._session(session_id, create)
+            return session.index if session else None
+
+    def sync(self, session_id: str, summaries: List[str], replace: bool = True) -> Dict:
+        with self._lock:
+            session = self._session(session_id, create=True)
+            session.syncing += 1
+        # Outside the manager lock: other sessions keep loading and querying while this one embeds
+        try:
+            stats = session.index.sync(summaries, replace=replace)
+        finally:
+            with self._lock:
+                session.syncing -= 1
+        with self._lock:
+            self._enforce_budget(keep=session_id)
+        return stats
+
+    def retrieval_chain(self, session_id: str):
+        """The session's retrieval chain, built on first use; None if the session has no summaries."""
+        with self._lock:
+            session = self._session(session_id, create=False)
+            if session is None or session.index.store is None:
+                return None
+            if session.chain is None:
+                session.chain = self.build_chain(session.index.as_retriever())
+            return session.chain
+
+    def evict(self, session_id: str):
+        with self._lock:
+            # Every sync already persisted the index, so dropping it from memory is enough
+            session = self._sessions.pop(session_id, None)
+            if session is not None:
+                self.stats["evictions"] += 1
+                logger.info(f"Evicted index for session {session_id}")
+
+    def status(self):
+        with self._lock:
+            now = time.monotonic()
+            sessions = {
+                session_id: {
+                    "summaries": len(session.index),
+                    "memory_bytes": session.index.memory_bytes(),
+                    "idle_seconds": now - session.last_used,
+                    "chain_built": session.chain is not None,
+                }
+                for session_id, session in self._sessions.items()
+            }
+            return {
+                **self.stats,
+                "loaded": len(sessions),
+                "memory_bytes": sum(s["memory_bytes"] for s in sessions.values()),
+                "memory_budget_bytes": self.memory_budget,
+                "sessions": sessions,
+            }
+
+    def _session(self, session_id, create):
+        session = self._sessions.get(session_id)
+        if session is None:
+            index = IncrementalIndex(self.embeddings, path=self.session_path(session_id))
+            if index.load():
+                self.stats["loads"] += 1
+            elif create:
+                self.stats["created"] += 1
+            else:
+                return None
+            session = _Session(index)
+            self._sessions[session_id] = session
+        self._sessions.move_to_end(session_id)
+        session.last_used = time.monotonic()
+        self._enforce_budget(keep=session_id)
+        return session
+
+    def _enforce_budget(self, keep):
+        now = time.monotonic()
+        # Sessions in the middle of a sync stay loaded so no query reloads a stale copy from disk
+        for session_id in [s for s, session in self._sessions.items()
+                           if s != keep and not session.syncing and now - session.last_used > self.idle_seconds]:
+            self.evict(session_id)
+        total = sum(session.index.memory_bytes() for session in self._sessions.values())
+        for session_id in list(self._sessions):
+            if total <= self.memory_budget:
+                break
+            if session_id == keep or self._sessions[session_id].syncing:
+                continue
+            total -= self._sessions[session_id].index.memory_bytes()
+            self.evict(session_id)
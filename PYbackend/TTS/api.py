@@ -1,14 +1,31 @@
-from fastapi import FastAPI, HTTPException, Form
-from fastapi.responses import FileResponse
-import torch
-import soundfile as sf
-import tempfile
+import time
+_import_start = time.perf_counter()
+
 import os
-from fastapi.middleware.cors import CORSMiddleware
-from starlette.background import BackgroundTask
-import numpy as np
+import sys
+# PYbackend/ holds the modules the three services share (common/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI, HTTPException, Form
 import re
-from fastapi.responses import StreamingResponse
+import asyncio
+import logging
+from collections import deque
+from concurrent.futures import Future
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from audio_cache import AudioCache, audio_key
+from audio_encoding import CODECS, SAMPLE_RATES, create_encoder
+from tts_engine import EngineBusy, TTSEngine, ensure_model
+from common.model_loader import ModelLoader
+from common.tracing import record, render_metrics, span, trace_requests
+
+# Time spent importing the app's modules, reported in the startup profile (torch loads with the model)
+IMPORT_SECONDS = time.perf_counter() - _import_start
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
 
 app = FastAPI(title="English Text to Speech (Silero TTS)")
@@ -20,20 +37,32 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
+# Stage timings go to /metrics; audio is streamed, so Server-Timing only covers the work before the first byte
+app.middleware("http")(trace_requests)
 
-# Load Silero TTS model
-def load_model():
-    model, _ = torch.hub.load(
-        repo_or_dir='snakers4/silero-models',
-        model='silero_tts',
-        language='en',
-        speaker='v3_en'
-    )
-    return model
-
-model = load_model()
+# Silero replicas in worker processes (see tts_engine); started on app startup
+engine = TTSEngine()
 speakers = ['en_112', 'en_8', 'en_63', 'en_0']  # Available speaker options
+SAMPLE_RATE = 48000
+# Characters of consecutive sentences synthesized together (as before caching). 0 = one sentence per
+# chunk: more Silero calls, but the audio cache can reuse every sentence that reappears elsewhere
+CHUNK_MAX_CHARS = int(os.getenv("TTS_CHUNK_MAX_CHARS", "1000"))
+audio_cache = AudioCache()
+
+# The model file, the replicas and their warm-up load in the background; /health/ready reports progress
+model_loader = ModelLoader("tts")
+model_loader.profile["import_seconds"] = IMPORT_SECONDS
+# Fetched once by the parent (skipped when TTS_MODEL_PATH already exists) so workers load it from disk
+model_loader.add_step("download", ensure_model)
+model_loader.add_step("load", engine.start)
+model_loader.add_step("warm_up", engine.warm_up)
+
+def require_ready():
+    if not model_loader.ready:
+        raise HTTPException(status_code=503, detail=f"TTS model is {model_loader.state}, retry shortly",
+                            headers={"Retry-After": "5"})
 
 # Helper: Split long text into small sentences for better audio
 def split_text(text, max_len=1000):
@@ -53,46 +82,168 @@ def split_text(text, max_len=1000):
 
     return chunks
 
-# Async cleanup function
-async def cleanup(file_path: str):
-    if os.path.exists(file_path):
-        os.unlink(file_path)
+def synthesize_chunk(chunk, speaker, sample_rate=SAMPLE_RATE) -> Future:
+    """Future PCM16 for one chunk: from the audio cache, or synthesized by the engine and then cached."""
+    key = audio_key(chunk, speaker, sample_rate)
+    result = Future()
+    with span("cache_lookup"):
+        pcm = audio_cache.get(key)
+    if pcm is not None:
+        result.set_result(pcm)
+        return result
+
+    def done(future):
+        if future.cancelled():
+            result.cancel()
+            return
+        error = future.exception()
+        if error is None:
+            pcm, _ = future.result()
+            # Cached even when the stream has gone away, since the synthesis is already paid for
+            audio_cache.put(key, pcm, sample_rate)
+        # False when the stream cancelled this chunk; a cancelled future cannot take a result
+        if not result.set_running_or_notify_cancel():
+            return
+        if error is not None:
+            result.set_exception(error)
+        else:
+            result.set_result(pcm)
+
+    synthesis = engine.submit(chunk, speaker, sample_rate)
+    synthesis.add_done_callback(done)
+    # Cancelling the chunk also cancels its synthesis, unless a replica has already started it
+    result.add_done_callback(lambda f: synthesis.cancel() if f.cancelled() else None)
+    return result
+
+async def stream_audio(chunks, speaker, sample_rate=SAMPLE_RATE, codec="wav"):
+    """Yield the encoded stream's header, then each chunk's audio in order as soon as it is ready.
+
+    Up to ``engine.window`` chunks are synthesized in parallel across the
+    engine's replicas, so memory stays bounded by that window rather than
+    the whole waveform.
+    """
+    start = time.perf_counter()
+    pending = deque()
+    upcoming = iter(enumerate(chunks))
+
+    def fill():
+        while len(pending) < engine.window:
+            item = next(upcoming, None)
+            if item is None:
+                break
+            pending.append((item[0], synthesize_chunk(item[1], speaker, sample_rate)))
+
+    try:
+        encoder = create_encoder(codec, sample_rate)
+        yield encoder.start()
+        first_audio = None
+        fill()
+        while pending:
+            i, future = pending.popleft()
+            try:
+                # Time this stream waits for the chunk on top of what earlier chunks already covered
+                with span("synthesis_wait"):
+                    pcm = await asyncio.wrap_future(future)
+            except Exception as e:
+                # The response has already started, so the stream just ends early
+                logger.error(f"Error generating chunk {i+1}: {e}")
+                return
+            fill()
+            # Compressed codecs may buffer a few frames, so an encoded chunk can be empty
+            with span("encode"):
+                data = await asyncio.to_thread(encoder.encode, pcm) if codec != "wav" else pcm
+            if first_audio is None and data:
+                first_audio = time.perf_counter() - start
+                record("first_audio", first_audio)
+                logger.info(f"First audio after {first_audio:.2f}s")
+            if data:
+                yield data
+        yield await asyncio.to_thread(encoder.finish)
+        # A compressed codec can hold every frame until finish(), so no chunk may have produced audio
+        first = f"{first_audio:.2f}s" if first_audio is not None else "only in the final flush"
+        logger.info(f"Streamed {len(chunks)} chunks in {time.perf_counter() - start:.2f}s (first audio {first})")
+    finally:
+        # Also reached when the client disconnects: drop chunks nobody will listen to (and their synthesis)
+        for _, future in pending:
+            future.cancel()
+
+class SlotStreamingResponse(StreamingResponse):
+    """Streaming response that hands its engine request slot back however it ends.
+
+    Released when the response is done rather than in the body generator,
+    which never runs if the client disconnects before the body starts.
+    """
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            engine.release()
 
 @app.post("/generate_audio")
-async def generate_audio(text: str = Form(...), speaker: str = Form(...)):
+async def generate_audio(text: str = Form(...), speaker: str = Form(...),
+                         sample_rate: int = Form(SAMPLE_RATE), codec: str = Form("wav")):
+    require_ready()
     if not text.strip():
         raise HTTPException(status_code=400, detail="Text cannot be empty.")
     if speaker not in speakers:
         raise HTTPException(status_code=400, detail=f"Invalid speaker. Choose from {speakers}.")
+    if sample_rate not in SAMPLE_RATES:
+        raise HTTPException(status_code=400, detail=f"Invalid sample rate. Choose from {list(SAMPLE_RATES)}.")
+    if codec not in CODECS:
+        raise HTTPException(status_code=400, detail=f"Invalid codec. Choose from {list(CODECS)}.")
+
+    logger.info(f"Generating {codec} audio at {sample_rate} Hz for text length: {len(text)} and speaker: {speaker}")
+    chunks = split_text(text, max_len=CHUNK_MAX_CHARS)
+    logger.info(f"Split into {len(chunks)} chunks")
 
+    # Backpressure: beyond TTS_MAX_ACTIVE_REQUESTS streams, tell the client to retry
     try:
-        print(f"Generating audio for text length: {len(text)} and speaker: {speaker}")
-        audio_segments = []
-        chunks = split_text(text)
-        print(f"Split into {len(chunks)} chunks")
-
-        for i, chunk in enumerate(chunks):
-            print(f"Generating chunk {i+1}: {chunk[:60]}...")
-            segment = model.apply_tts(text=chunk, speaker=speaker, sample_rate=48000)
-            audio_segments.append(segment)
-
-        full_audio = np.concatenate(audio_segments)
-
-        # Save audio to a temporary file
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
-        sf.write(temp_file.name, full_audio, 48000)
-        temp_file_path = temp_file.name
-        temp_file.close()
-
-        return StreamingResponse(
-        open(temp_file_path, "rb"),
-        media_type="audio/wav",
-        headers={"Content-Disposition": "attachment; filename=output.wav"},
-        background=BackgroundTask(cleanup, temp_file_path)
-        )
+        engine.admit()
+    except EngineBusy as e:
+        raise HTTPException(status_code=503, detail=f"TTS is busy, retry shortly: {e}", headers={"Retry-After": "2"})
 
-    except Exception as e:
-        print("❌ Error generating audio:", str(e))
-        if 'temp_file_path' in locals() and os.path.exists(temp_file_path):
-            os.unlink(temp_file_path)
-        raise HTTPException(status_code=500, detail=f"Error generating audio: {str(e)}")
+    try:
+        media_type, extension = CODECS[codec]
+        return SlotStreamingResponse(
+            stream_audio(chunks, speaker, sample_rate, codec),
+            media_type=media_type,
+            headers={"Content-Disposition": f"attachment; filename=output.{extension}"}
+        )
+    except Exception:
+        engine.release()
+        raise
+
+@app.get("/metrics")
+async def metrics():
+    # Prometheus text format: per-stage and per-route latency histograms
+    return PlainTextResponse(render_metrics("tts"), media_type="text/plain; version=0.0.4")
+
+@app.get("/cache/stats")
+async def cache_stats():
+    return audio_cache.metrics()
+
+@app.get("/engine/stats")
+async def engine_stats():
+    return {**engine.metrics(), "replica_load_seconds": engine.replica_load_seconds}
+
+@app.get("/health/live")
+async def health_live():
+    # The process is up and serving; model loading may still be in progress
+    return {"status": "alive", "state": model_loader.state}
+
+@app.get("/health/ready")
+async def health_ready():
+    status = model_loader.status()
+    return JSONResponse(status_code=200 if model_loader.ready else 503, content=status)
+
+@app.on_event("startup")
+async def startup_event():
+    # Returns immediately; the service accepts connections while the replicas load
+    model_loader.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    engine.shutdown()
+    # Keep this session's segments for the next start
+    audio_cache.flush()
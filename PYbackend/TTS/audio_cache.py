@@ -0,0 +1,179 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+import soundfile as sf
+
+AUDIO_CACHE_MB = float(os.getenv("TTS_AUDIO_CACHE_MB", "256"))
+AUDIO_CACHE_DIR = os.getenv("TTS_AUDIO_CACHE_DIR", "audio_cache")  # empty keeps the cache in memory only
+AUDIO_CACHE_DISK_MB = float(os.getenv("TTS_AUDIO_CACHE_DISK_MB", "2048"))
+
+
+def audio_key(text, speaker, sample_rate):
+    normalized = " ".join(text.split())
+    return hashlib.sha256(f"{speaker}\x00{sample_rate}\x00{normalized}".encode("utf-8")).hexdigest()
+
+
+class AudioCache:
+    """LRU cache of synthesized PCM16 segments that spills to FLAC files.
+
+    Segments live in memory up to ``memory_mb``. The least recently used ones
+    are then written to ``cache_dir`` as FLAC (lossless, roughly half the
+    size of raw PCM) and read back on a later hit. The directory is pruned,
+    oldest first, to ``disk_mb``.
+    """
+
+    def __init__(self, memory_mb=AUDIO_CACHE_MB, cache_dir=AUDIO_CACHE_DIR, disk_mb=AUDIO_CACHE_DISK_MB):
+        self.memory_budget = int(memory_mb * 1024 * 1024)
+        self.disk_budget = int(disk_mb * 1024 * 1024)
+        self.cache_dir = cache_dir
+        self._memory = OrderedDict()  # key -> (pcm bytes, sample rate)
+        self._memory_bytes = 0
+        self._disk = OrderedDict()  # key -> file size, oldest first
+        self._disk_bytes = 0
+        self._writing = set()  # keys being spilled right now
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "bytes_saved": 0,
+                      "spilled": 0, "disk_evictions": 0}
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._scan_disk()
+
+    def get(self, key):
+        """PCM16 bytes for ``key``, or None on a miss."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                self.stats["bytes_saved"] += len(entry[0])
+                return entry[0]
+        entry = self._read_disk(key)
+        with self._lock:
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["disk_hits"] += 1
+            self.stats["bytes_saved"] += len(entry[0])
+        self.put(key, *entry)
+        return entry[0]
+
+    def put(self, key, pcm, sample_rate):
+        spill = []
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_bytes -= len(old[0])
+            self._memory[key] = (pcm, sample_rate)
+            self._memory_bytes += len(pcm)
+            while self._memory_bytes > self.memory_budget and len(self._memory) > 1:
+                evicted_key, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted[0])
+                spill.append((evicted_key, evicted))
+        for evicted_key, (evicted_pcm, evicted_rate) in spill:
+            self._write_disk(evicted_key, evicted_pcm, evicted_rate)
+
+    def flush(self):
+        """Write every in-memory segment to disk, e.g. before shutdown."""
+        with self._lock:
+            entries = list(self._memory.items())
+        for key, (pcm, sample_rate) in entries:
+            self._write_disk(key, pcm, sample_rate)
+
+    def metrics(self):
+        with self._lock:
+            stats = dict(self.stats)
+            memory_entries, memory_bytes = len(self._memory), self._memory_bytes
+        with self._disk_lock:
+            disk_entries, disk_bytes = len(self._disk), self._disk_bytes
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        lookups = hits + stats["misses"]
+        return {
+            **stats,
+            "hits": hits,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "memory_entries": memory_entries,
+            "memory_bytes": memory_bytes,
+            "memory_budget_bytes": self.memory_budget,
+            "disk_entries": disk_entries,
+            "disk_bytes": disk_bytes,
+            "disk_budget_bytes": self.disk_budget if self.cache_dir else 0,
+        }
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.flac")
+
+    def _scan_disk(self):
+        files = []
+        for root, _, names in os.walk(self.cache_dir):
+            for name in names:
+                if name.endswith(".flac"):
+                    path = os.path.join(root, name)
+                    stat = os.stat(path)
+                    files.append((stat.st_mtime, name[:-len(".flac")], stat.st_size))
+        for _, key, size in sorted(files):
+            self._disk[key] = size
+            self._disk_bytes += size
+
+    def _read_disk(self, key):
+        if not self.cache_dir:
+            return None
+        with self._disk_lock:
+            if key not in self._disk:
+                return None
+            self._disk.move_to_end(key)
+        try:
+            audio, sample_rate = sf.read(self._path(key), dtype="int16")
+        except (OSError, RuntimeError):
+            self._forget(key)
+            return None
+        return audio.astype("<i2").tobytes(), sample_rate
+
+    def _write_disk(self, key, pcm, sample_rate):
+        if not self.cache_dir:
+            return
+        # Reserve the key first: an eviction and the shutdown flush can spill the same segment at once,
+        # and only one of them may write the file and count its bytes
+        with self._disk_lock:
+            if key in self._disk:
+                self._disk.move_to_end(key)
+                return
+            if key in self._writing:
+                return
+            self._writing.add(key)
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write under a temporary name so a reader never sees a partial file
+            sf.write(path + ".tmp", np.frombuffer(pcm, dtype="<i2"), sample_rate, format="FLAC", subtype="PCM_16")
+            os.replace(path + ".tmp", path)
+            size = os.path.getsize(path)
+        except BaseException:
+            with self._disk_lock:
+                self._writing.discard(key)
+            raise
+        with self._disk_lock:
+            self._writing.discard(key)
+            self._disk[key] = size
+            self._disk_bytes += size
+            stale = []
+            while self._disk_bytes > self.disk_budget and len(self._disk) > 1:
+                old_key, old_size = self._disk.popitem(last=False)
+                self._disk_bytes -= old_size
+                stale.append(old_key)
+        with self._lock:
+            self.stats["spilled"] += 1
+            self.stats["disk_evictions"] += len(stale)
+        for old_key in stale:
+            try:
+                os.unlink(self._path(old_key))
+            except OSError:
+                pass
+
+    def _forget(self, key):
+        with self._disk_lock:
+            size = self._disk.pop(key, None)
+            if size is not None:
+                self._disk_bytes -= size
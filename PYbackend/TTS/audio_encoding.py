@@ -0,0 +1,172 @@
+import struct
+import numpy as np
+import soundfile as sf
+
+# Rates Silero v3 synthesizes natively, so none of them needs resampling
+SAMPLE_RATES = (8000, 24000, 48000)
+# codec -> (media type, file extension)
+CODECS = {
+    "wav": ("audio/wav", "wav"),
+    "opus": ("audio/ogg", "ogg"),
+    "mp3": ("audio/mpeg", "mp3"),
+}
+
+
+# WAV header for a stream whose length is not known up front: the RIFF and data sizes
+# are set to the maximum, which players treat as "read until the stream ends"
+def wav_header(sample_rate, channels=1, bits_per_sample=16):
+    block_align = channels * bits_per_sample // 8
+    return (
+        b"RIFF" + struct.pack("<I", 0xFFFFFFFF) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHH", 16, 1, channels, sample_rate,
+                                sample_rate * block_align, block_align, bits_per_sample)
+        + b"data" + struct.pack("<I", 0xFFFFFFFF)
+    )
+
+
+def create_encoder(codec, sample_rate):
+    if codec == "wav":
+        return WavEncoder(sample_rate)
+    if codec == "opus":
+        return SoundFileEncoder(sample_rate, "OGG", "OPUS")
+    if codec == "mp3":
+        return Mp3Encoder(sample_rate)
+    raise ValueError(f"Unsupported codec {codec}; choose from {list(CODECS)}")
+
+
+class WavEncoder:
+    """PCM16 WAV: the header, then the PCM as it comes."""
+
+    def __init__(self, sample_rate):
+        self.sample_rate = sample_rate
+
+    def start(self):
+        return wav_header(self.sample_rate)
+
+    def encode(self, pcm):
+        return pcm
+
+    def finish(self):
+        return b""
+
+
+class _StreamSink:
+    """Append-only file object for libsndfile that hands out what was written since the last drain.
+
+    Bytes already handed out cannot be changed, so writes behind the end
+    (header rewrites some formats do on close) are dropped.
+    """
+
+    def __init__(self):
+        self._pending = bytearray()
+        self._size = 0
+        self._pos = 0
+
+    def write(self, data):
+        data = bytes(data)
+        if self._pos == self._size:
+            self._pending += data
+            self._size += len(data)
+        self._pos += len(data)
+        return len(data)
+
+    def seek(self, offset, whence=0):
+        if whence == 1:
+            offset += self._pos
+        elif whence == 2:
+            offset += self._size
+        self._pos = offset
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+    def read(self, size=-1):
+        return b""
+
+    def drain(self):
+        data = bytes(self._pending)
+        self._pending.clear()
+        return data
+
+
+class SoundFileEncoder:
+    """Compressed stream encoded by libsndfile, returned piece by piece as chunks are written."""
+
+    def __init__(self, sample_rate, format, subtype):
+        self.sink = _StreamSink()
+        self.file = sf.SoundFile(self.sink, mode="w", samplerate=sample_rate, channels=1,
+                                 format=format, subtype=subtype)
+
+    def start(self):
+        return self.sink.drain()
+
+    def encode(self, pcm):
+        self.file.write(np.frombuffer(pcm, dtype="<i2"))
+        return self.sink.drain()
+
+    def finish(self):
+        self.file.close()
+        return self.sink.drain()
+
+
+# MPEG Layer III bitrates (kbps) by header index, for MPEG-1 and for MPEG-2/2.5
+_MP3_BITRATES = {
+    1: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MP3_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+
+def mp3_frame_length(header):
+    """Byte length of the Layer III frame starting with the 4-byte ``header``."""
+    version = (header[1] >> 3) & 0b11  # 3 = MPEG-1, 2 = MPEG-2, 0 = MPEG-2.5
+    bitrate = _MP3_BITRATES[1 if version == 3 else 2][header[2] >> 4] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version][(header[2] >> 2) & 0b11]
+    padding = (header[2] >> 1) & 1
+    return (144 if version == 3 else 72) * bitrate // sample_rate + padding
+
+
+class Mp3Encoder(SoundFileEncoder):
+    """MP3 without the leading Xing/Info frame.
+
+    The encoder reserves the first frame as an all-zero placeholder for that
+    tag and fills it in on close, which a stream cannot do, so the
+    placeholder is dropped and players just decode the frames that follow.
+    """
+
+    def __init__(self, sample_rate):
+        super().__init__(sample_rate, "MP3", "MPEG_LAYER_III")
+        self._head = bytearray()
+        self._checked = False
+
+    def start(self):
+        return self._strip(self.sink.drain())
+
+    def encode(self, pcm):
+        self.file.write(np.frombuffer(pcm, dtype="<i2"))
+        return self._strip(self.sink.drain())
+
+    def finish(self):
+        self.file.close()
+        data = self._strip(self.sink.drain())
+        if not self._checked:
+            self._checked = True
+            data += bytes(self._head)
+        return data
+
+    def _strip(self, data):
+        if self._checked:
+            return data
+        self._head += data
+        if len(self._head) < 4:
+            return b""
+        length = mp3_frame_length(self._head)
+        if len(self._head) < length:
+            return b""
+        self._checked = True
+        first = bytes(self._head[:length])
+        rest = bytes(self._head[length:])
+        if not any(first[4:]) or b"Xing" in first or b"Info" in first:
+            return rest
+        return first + rest
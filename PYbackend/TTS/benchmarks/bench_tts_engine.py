@@ -0,0 +1,81 @@
+"""Real-time factor and throughput of the TTS engine versus worker count.
+
+Synthesizes the same batch of sentences with 1, 2, 4... workers and reports
+the real-time factor (compute seconds per second of audio) and throughput
+(seconds of audio produced per wall-clock second).
+
+    cd PYbackend/TTS
+    python benchmarks/bench_tts_engine.py --workers 1,2,4 --sentences 64
+
+``--stub`` swaps Silero for a CPU-bound stand-in, to check the pool's
+scaling on a machine without the model.
+"""
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# PYbackend/, for the modules the services share (common/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from tts_engine import TTSEngine, load_model
+
+SENTENCE = "The summary of this article explains how caching and batching change the latency of a service."
+
+
+class StubModel:
+    """Burns CPU roughly in proportion to the text length and returns a tone."""
+
+    def apply_tts(self, text, speaker, sample_rate):
+        values = np.random.default_rng(len(text)).random(200_000)
+        for _ in range(len(text) // 10):
+            values = np.sqrt(values + 1.0)
+        seconds = len(text.split()) * 0.3
+        return np.sin(np.arange(int(sample_rate * seconds)) / 20).astype(np.float32) * 0.3
+
+
+def load_stub():
+    return StubModel()
+
+
+def run(workers, threads, sentences, sample_rate, stub):
+    engine = TTSEngine(workers=workers, threads_per_worker=threads, loader=load_stub if stub else load_model)
+    engine.start()
+    try:
+        texts = [f"{SENTENCE} Number {i}." for i in range(sentences)]
+        start = time.perf_counter()
+        futures = [engine.submit(text, "en_0", sample_rate) for text in texts]
+        audio_bytes = sum(len(future.result()[0]) for future in futures)
+        wall = time.perf_counter() - start
+        metrics = engine.metrics()
+    finally:
+        engine.shutdown()
+    audio_seconds = audio_bytes / 2 / sample_rate
+    return {
+        "workers": workers,
+        "threads": engine.threads_per_worker,
+        "wall": wall,
+        "rtf": metrics["real_time_factor"],
+        "throughput": audio_seconds / wall,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default="1,2,4", help="comma-separated worker counts")
+    parser.add_argument("--threads", type=int, default=0, help="torch threads per worker (0 = split cores evenly)")
+    parser.add_argument("--sentences", type=int, default=64)
+    parser.add_argument("--sample-rate", type=int, default=48000)
+    parser.add_argument("--stub", action="store_true", help="use a CPU-bound stand-in instead of Silero")
+    args = parser.parse_args()
+
+    print(f"{'workers':>7} {'threads':>7} {'wall s':>8} {'RTF':>6} {'audio s / s':>11}")
+    for workers in [int(w) for w in args.workers.split(",")]:
+        r = run(workers, args.threads, args.sentences, args.sample_rate, args.stub)
+        print(f"{r['workers']:>7} {r['threads']:>7} {r['wall']:>8.2f} {r['rtf']:>6.3f} {r['throughput']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Payload size and time per sample rate and codec.
+
+Synthesizes the same text once per sample rate (natively, no resampling),
+then streams it through each codec's encoder chunk by chunk, as
+/generate_audio does, and reports synthesis time, encode time and bytes.
+
+    cd PYbackend/TTS
+    python benchmarks/bench_tts_formats.py --sentences 40
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# PYbackend/, for the modules the services share (common/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from audio_encoding import CODECS, SAMPLE_RATES, create_encoder
+from tts_engine import TTSEngine, load_model
+from bench_tts_engine import SENTENCE, load_stub
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sentences", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=0, help="engine workers (0 = in-process)")
+    parser.add_argument("--stub", action="store_true", help="use a CPU-bound stand-in instead of Silero")
+    args = parser.parse_args()
+
+    texts = [f"{SENTENCE} Number {i}." for i in range(args.sentences)]
+    engine = TTSEngine(workers=args.workers, loader=load_stub if args.stub else load_model)
+    engine.start()
+    print(f"{'rate':>6} {'codec':>5} {'synth s':>8} {'encode s':>9} {'KiB':>9} {'kbit/s':>7}")
+    try:
+        for sample_rate in SAMPLE_RATES:
+            start = time.perf_counter()
+            segments = [future.result()[0] for future in [engine.submit(t, "en_0", sample_rate) for t in texts]]
+            synth = time.perf_counter() - start
+            duration = sum(len(pcm) for pcm in segments) / 2 / sample_rate
+            for codec in CODECS:
+                start = time.perf_counter()
+                encoder = create_encoder(codec, sample_rate)
+                size = len(encoder.start())
+                for pcm in segments:
+                    size += len(encoder.encode(pcm))
+                size += len(encoder.finish())
+                encode = time.perf_counter() - start
+                print(f"{sample_rate:>6} {codec:>5} {synth:>8.2f} {encode:>9.3f} {size / 1024:>9.1f} "
+                      f"{size * 8 / 1000 / duration:>7.1f}")
+    finally:
+        engine.shutdown()
+
+
+if __name__ == "__main__":
+    main()
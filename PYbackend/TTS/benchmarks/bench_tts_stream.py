@@ -0,0 +1,59 @@
+"""Measure time-to-first-byte and time-to-first-audio of /generate_audio.
+
+Start the TTS service, then run:
+
+    python benchmarks/bench_tts_stream.py --url http://localhost:8000 --sentences 40
+
+TTFB is when the response starts (the WAV header). First audio is when the
+first PCM bytes after the 44-byte header arrive, which is what a player
+needs before it can start; for Opus/MP3 it is the first encoded bytes.
+"""
+import time
+import argparse
+import statistics
+import httpx
+
+WAV_HEADER_BYTES = 44
+SENTENCE = "Streaming lets the listener start hearing the summary while the rest is still being generated."
+
+
+def measure(client, url, text, speaker, sample_rate, codec):
+    start = time.perf_counter()
+    ttfb = first_audio = None
+    received = 0
+    header_bytes = WAV_HEADER_BYTES if codec == "wav" else 0
+    data = {"text": text, "speaker": speaker, "sample_rate": sample_rate, "codec": codec}
+    with client.stream("POST", f"{url}/generate_audio", data=data) as response:
+        response.raise_for_status()
+        for block in response.iter_bytes():
+            if not block:
+                continue
+            received += len(block)
+            if ttfb is None:
+                ttfb = time.perf_counter() - start
+            if first_audio is None and received > header_bytes:
+                first_audio = time.perf_counter() - start
+    return {"ttfb": ttfb, "first_audio": first_audio, "total": time.perf_counter() - start, "bytes": received}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--speaker", default="en_0")
+    parser.add_argument("--sentences", type=int, default=40)
+    parser.add_argument("--sample-rate", type=int, default=48000)
+    parser.add_argument("--codec", default="wav", choices=["wav", "opus", "mp3"])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    text = " ".join([SENTENCE] * args.sentences)
+    with httpx.Client(timeout=600) as client:
+        runs = [measure(client, args.url, text, args.speaker, args.sample_rate, args.codec) for _ in range(args.runs)]
+
+    for key in ("ttfb", "first_audio", "total"):
+        print(f"{key:>12}: median {statistics.median(r[key] for r in runs) * 1000:.0f} ms")
+    print(f"{'bytes':>12}: {runs[-1]['bytes']}")
+
+
+if __name__ == "__main__":
+    main()
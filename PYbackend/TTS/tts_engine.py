@@ -0,0 +1,191 @@
+import os
+import time
+import threading
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import numpy as np
+from common.tracing import record
+
+logger = logging.getLogger(__name__)
+
+# Worker processes, each with its own Silero replica; 0 runs one model in-process
+TTS_WORKERS = int(os.getenv("TTS_WORKERS", str(max(1, min(4, (os.cpu_count() or 2) // 2)))))
+# Intra-op threads per replica; by default the cores are split evenly between workers
+TTS_THREADS_PER_WORKER = int(os.getenv("TTS_THREADS_PER_WORKER", "0"))
+# Requests allowed to stream at once; further requests are rejected until one finishes
+TTS_MAX_ACTIVE_REQUESTS = int(os.getenv("TTS_MAX_ACTIVE_REQUESTS", "16"))
+# Silero v3 English as a standalone torch package: downloaded once, then always loaded from disk
+TTS_MODEL_PATH = os.getenv("TTS_MODEL_PATH", "models/silero_v3_en.pt")
+TTS_MODEL_URL = os.getenv("TTS_MODEL_URL", "https://models.silero.ai/models/tts/en/v3_en.pt")
+# With TTS_OFFLINE=1 a missing model file is an error instead of a download
+TTS_OFFLINE = os.getenv("TTS_OFFLINE", "0") == "1"
+
+
+class EngineBusy(Exception):
+    pass
+
+
+def ensure_model(path=TTS_MODEL_PATH):
+    """Download the model package to ``path`` unless it is already there."""
+    if os.path.isfile(path):
+        return path
+    if TTS_OFFLINE:
+        raise FileNotFoundError(f"TTS model {path} not found and TTS_OFFLINE=1")
+    logger.info(f"Downloading TTS model to {path}")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    partial = f"{path}.{os.getpid()}.tmp"
+    import torch
+    torch.hub.download_url_to_file(TTS_MODEL_URL, partial)
+    os.replace(partial, path)
+    return path
+
+# Load Silero TTS model (the same model torch.hub's silero_tts/v3_en returns, without the GitHub round trip)
+def load_model():
+    # torch is imported here, in the loading step, so neither the app import nor stand-in models pay for it
+    import torch
+    return torch.package.PackageImporter(ensure_model()).load_pickle("tts_models", "model")
+
+# Float waveform in [-1, 1] -> little-endian 16-bit PCM
+def to_pcm16(segment):
+    audio = segment.numpy() if hasattr(segment, "numpy") else np.asarray(segment)
+    return (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+
+# Per-process state of a pool worker
+_model = None
+_load_seconds = 0.0
+
+
+def _init_worker(loader, threads):
+    global _model, _load_seconds
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass  # stand-in models (benchmarks, load tests) run without torch
+    start = time.perf_counter()
+    _model = loader()
+    _load_seconds = time.perf_counter() - start
+
+
+def _ping(hold):
+    # Held briefly so each ping lands on a different worker
+    time.sleep(hold)
+    return os.getpid(), _load_seconds
+
+
+def _synthesize(text, speaker, sample_rate):
+    start = time.perf_counter()
+    pcm = to_pcm16(_model.apply_tts(text=text, speaker=speaker, sample_rate=sample_rate))
+    return pcm, time.perf_counter() - start
+
+
+class TTSEngine:
+    """Pool of Silero replicas that chunks from every request fan out over.
+
+    Each worker process loads its own model in ``loader`` and pins torch to
+    ``threads_per_worker`` threads, so workers do not fight over cores. Callers
+    keep at most ``window`` chunks of a request in flight and read results in
+    order. At most ``max_active`` requests are admitted at once; the rest get
+    ``EngineBusy`` so the client can retry instead of queueing without bound.
+    """
+
+    def __init__(self, workers=TTS_WORKERS, threads_per_worker=TTS_THREADS_PER_WORKER,
+                 max_active=TTS_MAX_ACTIVE_REQUESTS, loader=load_model):
+        self.workers = max(0, workers)
+        self.threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // max(1, self.workers))
+        self.max_active = max_active
+        self.loader = loader
+        self.window = max(2, self.workers * 2)
+        self._executor = None
+        self.replica_load_seconds = {}  # worker pid -> seconds spent loading its model
+        self._active = threading.BoundedSemaphore(max_active)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "rejected": 0, "active": 0, "chunks": 0, "failed": 0,
+                      "synth_seconds": 0.0, "audio_seconds": 0.0, "startup_seconds": 0.0}
+
+    def start(self):
+        """Start the workers and wait until every replica has loaded its model."""
+        start = time.perf_counter()
+        initargs = (self.loader, self.threads_per_worker)
+        if self.workers:
+            # spawn, not fork: forking a process that already runs torch threads can deadlock
+            self._executor = ProcessPoolExecutor(
+                self.workers, mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker, initargs=initargs
+            )
+        else:
+            self._executor = ThreadPoolExecutor(1, initializer=_init_worker, initargs=initargs)
+        # A worker only takes tasks once its model has loaded, so an answer from each means all are ready
+        for _ in range(10):
+            pings = [self._executor.submit(_ping, 0.2) for _ in range(max(1, self.workers))]
+            self.replica_load_seconds.update(f.result() for f in pings)
+            if len(self.replica_load_seconds) >= max(1, self.workers):
+                break
+        self.stats["startup_seconds"] = time.perf_counter() - start
+        logger.info(f"TTS engine ready: {len(self.replica_load_seconds)} replica(s) x {self.threads_per_worker} thread(s) "
+              f"in {self.stats['startup_seconds']:.1f}s")
+
+    def warm_up(self, sample_rates=(48000,)):
+        """Run one short synthesis per replica and sample rate, so no request pays for first-call setup."""
+        futures = [self._executor.submit(_synthesize, "Warming up.", "en_0", rate)
+                   for rate in sample_rates for _ in range(max(1, self.workers))]
+        for future in futures:
+            future.result()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def admit(self):
+        """Reserve a request slot; raises EngineBusy when ``max_active`` requests are streaming."""
+        if not self._active.acquire(blocking=False):
+            with self._lock:
+                self.stats["rejected"] += 1
+            raise EngineBusy(f"{self.max_active} requests already in progress")
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["active"] += 1
+
+    def release(self):
+        with self._lock:
+            self.stats["active"] -= 1
+        self._active.release()
+
+    def submit(self, text, speaker, sample_rate):
+        """Synthesize one chunk on the next free replica.
+
+        The future resolves to ``(pcm16 bytes, synthesis seconds)``.
+        """
+        future = self._executor.submit(_synthesize, text, speaker, sample_rate)
+        future.add_done_callback(lambda f: self._record(f, sample_rate))
+        return future
+
+    def metrics(self):
+        with self._lock:
+            stats = dict(self.stats)
+        return {
+            **stats,
+            "workers": self.workers,
+            "threads_per_worker": self.threads_per_worker,
+            "max_active": self.max_active,
+            "window": self.window,
+            # Seconds of compute per second of audio (lower is faster; < 1 is faster than real time)
+            "real_time_factor": stats["synth_seconds"] / stats["audio_seconds"] if stats["audio_seconds"] else 0.0,
+        }
+
+    def _record(self, future, sample_rate):
+        if future.cancelled():
+            return
+        with self._lock:
+            if future.exception() is not None:
+                self.stats["failed"] += 1
+                return
+            pcm, seconds = future.result()
+            self.stats["chunks"] += 1
+            self.stats["synth_seconds"] += seconds
+            self.stats["audio_seconds"] += len(pcm) / 2 / sample_rate
+        # Compute time measured inside the replica, without queueing
+        record("synthesis", seconds)
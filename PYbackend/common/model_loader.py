@@ -0,0 +1,87 @@
+import sys
+import time
+import logging
+import threading
+from typing import Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ModelLoader:
+    """Runs a service's slow startup steps (weights, warm-up) in a background thread.
+
+    The app starts accepting connections right away; ``/health/ready`` reports
+    ``loading`` until every step has finished, then ``ready`` (or ``failed``
+    with the error). Each step's duration goes into ``profile`` next to the
+    import time the service records, so a slow start can be attributed to
+    imports, weight loading or warm-up.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = "pending"
+        self.error = None
+        self.current_step = None
+        self.profile: Dict[str, float] = {}
+        self._steps: List[Tuple[str, Callable]] = []
+        self._done = threading.Event()
+        self._created = time.perf_counter()
+
+    def add_step(self, name: str, fn: Callable):
+        self._steps.append((name, fn))
+
+    def start(self):
+        if self.state != "pending":
+            return
+        self.state = "loading"
+        threading.Thread(target=self._run, name=f"{self.name}-loader", daemon=True).start()
+
+    def wait(self, timeout=None) -> bool:
+        self._done.wait(timeout)
+        return self.ready
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    def status(self) -> Dict:
+        return {
+            "service": self.name,
+            "state": self.state,
+            "step": self.current_step,
+            "error": self.error,
+            "profile": dict(self.profile),
+        }
+
+    def _run(self):
+        start = time.perf_counter()
+        try:
+            for name, fn in self._steps:
+                self.current_step = name
+                step_start = time.perf_counter()
+                fn()
+                self.profile[f"{name}_seconds"] = time.perf_counter() - step_start
+                logger.info(f"{self.name}: {name} took {self.profile[f'{name}_seconds']:.2f}s")
+            self.profile["ready_after_seconds"] = time.perf_counter() - self._created
+            self.current_step = None
+            self.state = "ready"
+            logger.info(f"{self.name} ready in {time.perf_counter() - start:.2f}s: {self.profile}")
+        except Exception as e:
+            self.error = str(e)
+            self.state = "failed"
+            logger.error(f"{self.name} failed during {self.current_step}: {e}")
+        finally:
+            self._done.set()
+
+
+def snapshot(model_id: str, local_dir: str):
+    """Download ``model_id`` into ``local_dir`` so the service can load it with no network access."""
+    from huggingface_hub import snapshot_download
+    return snapshot_download(repo_id=model_id, local_dir=local_dir)
+
+
+if __name__ == "__main__":
+    # From PYbackend/: python -m common.model_loader facebook/bart-large-cnn scrapers/models/bart-large-cnn
+    if len(sys.argv) != 3:
+        sys.exit("usage: python -m common.model_loader <model id> <local dir>")
+    print(snapshot(sys.argv[1], sys.argv[2]))
@@ -0,0 +1,124 @@
+import time
+import functools
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+# Histogram bucket upper bounds in seconds, from a cache hit to a cold browser launch
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Stage timings of the request being served; executor work joins it through ``with_context``
+_request_timings = contextvars.ContextVar("request_timings", default=None)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set, rendered in the Prometheus text format."""
+
+    def __init__(self, name: str, help: str, label_names: Tuple[str, ...], buckets=BUCKETS):
+        self.name = name
+        self.help = help
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series: Dict[Tuple, List] = {}  # labels -> [count per bucket..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self, service: str) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: list(values) for labels, values in self._series.items()}
+        for labels, values in sorted(series.items()):
+            pairs = [("service", service)] + list(zip(self.label_names, labels))
+            label_text = ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+            for bound, count in zip(self.buckets, values):
+                lines.append(f'{self.name}_bucket{{{label_text},le="{bound}"}} {count}')
+            lines.append(f'{self.name}_bucket{{{label_text},le="+Inf"}} {values[-1]}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {values[-2]}")
+            lines.append(f"{self.name}_count{{{label_text}}} {values[-1]}")
+        return lines
+
+
+stage_seconds = Histogram("simplify_stage_seconds", "Time spent in each pipeline stage", ("stage",))
+request_seconds = Histogram("simplify_request_seconds", "HTTP request time until the response starts",
+                            ("method", "route", "status"))
+
+
+class RequestTimings:
+    """Stage durations of one request, summed per stage, for its Server-Timing header."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages: Dict[str, List] = {}  # stage -> [seconds, count]
+
+    def add(self, stage: str, seconds: float):
+        with self._lock:
+            totals = self.stages.setdefault(stage, [0.0, 0])
+            totals[0] += seconds
+            totals[1] += 1
+
+    def server_timing(self, total: float) -> str:
+        with self._lock:
+            parts = [f'{stage};dur={seconds * 1000:.1f};desc="{count}x"'
+                     for stage, (seconds, count) in self.stages.items()]
+        return ", ".join(parts + [f"total;dur={total * 1000:.1f}"])
+
+
+def record(stage: str, seconds: float):
+    """Add one stage duration to the histograms and to the current request's timings, if any."""
+    stage_seconds.observe(seconds, stage)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.add(stage, seconds)
+
+
+@contextmanager
+def span(stage: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - start)
+
+
+def with_context(fn, *args, **kwargs):
+    """``fn`` bound to a copy of the caller's context, so spans it runs on another thread count toward this request."""
+    return functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+async def trace_requests(request, call_next):
+    """HTTP middleware: per-route latency histogram and a Server-Timing header with the request's stages.
+
+    Streaming responses start before their body is produced, so their header
+    only covers the work done before the first byte.
+    """
+    timings = RequestTimings()
+    token = _request_timings.set(timings)
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        _request_timings.reset(token)
+    elapsed = time.perf_counter() - start
+    route = getattr(request.scope.get("route"), "path", "unmatched")
+    request_seconds.observe(elapsed, request.method, route, str(response.status_code))
+    response.headers["Server-Timing"] = timings.server_timing(elapsed)
+    return response
+
+
+def render_metrics(service: str) -> str:
+    return "\n".join(stage_seconds.render(service) + request_seconds.render(service)) + "\n"
@@ -0,0 +1,232 @@
+"""Drive the scrapers, ChatBot and TTS APIs at a fixed concurrency and report throughput, latency and stage times.
+
+Starts each service through ``serve_stubbed.py`` (fixture sites, stand-in
+LLM; with ``--stub-models`` stand-in models too), waits for /health/ready,
+then runs ``--concurrency`` clients per service for ``--duration`` seconds:
+
+    cd PYbackend
+    python loadtest/run_loadtest.py --stub-models --duration 30 --json before.json
+    python loadtest/run_loadtest.py --stub-models --duration 30 --baseline before.json
+
+scrapers: /scrape-and-summarize for devto, wix and medium, a new keyword per request
+    (the articles repeat the fixtures' text, so after the first requests their
+    chunks come from the summary cache and the model sees little load)
+chatbot: /summaries once per client session, then /query
+tts: /generate_audio with sentences from the fixture articles
+
+For each service it prints requests/s, errors and p50/p95/p99 latency, then
+the mean time per stage read from the service's /metrics. ``--baseline``
+adds the change against an earlier ``--json`` result, so a throughput
+regression shows up as a negative req/s delta.
+"""
+import os
+import re
+import sys
+import json
+import time
+import asyncio
+import argparse
+import itertools
+import subprocess
+import tempfile
+
+import httpx
+from lxml import html
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = os.path.join(os.path.dirname(HERE), "scrapers", "benchmarks", "fixtures")
+SERVICES = ("scrapers", "chatbot", "tts")
+QUESTIONS = ["What is the main idea?", "Which trade-offs are mentioned?", "How is performance measured?",
+             "What should be done first?"]
+STAGE_LINE = re.compile(r'^simplify_stage_seconds_(sum|count)\{service="[^"]*",stage="([^"]*)"\} (\S+)$')
+
+
+def fixture_sentences():
+    sentences = []
+    for name in sorted(os.listdir(FIXTURES)):
+        tree = html.parse(os.path.join(FIXTURES, name))
+        for paragraph in tree.xpath("//p"):
+            text = " ".join(paragraph.text_content().split())
+            sentences.extend(s for s in re.split(r"(?<=[.!?])\s+", text) if len(s.split()) >= 5)
+    return sentences
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+class Workload:
+    """Requests one client of a service sends; ``setup`` runs once per client before timing starts."""
+
+    def __init__(self, sentences, articles):
+        self.sentences = sentences
+        self.articles = articles
+        self.counter = itertools.count()
+
+    async def setup(self, service, client, worker):
+        if service == "chatbot":
+            summaries = [" ".join(self.sentences[i:i + 4]) for i in range(worker, len(self.sentences), 4)][:20]
+            response = await client.post("/summaries", json={"summaries": summaries,
+                                                             "session_id": f"loadtest-{worker}"}, timeout=300)
+            response.raise_for_status()
+
+    async def request(self, service, client, worker):
+        n = next(self.counter)
+        if service == "scrapers":
+            return await client.get("/scrape-and-summarize", params={
+                "keyword": f"load test {n}", "sites": "devto,wix,medium", "articles": self.articles})
+        if service == "chatbot":
+            return await client.post("/query", json={"query": QUESTIONS[n % len(QUESTIONS)],
+                                                     "session_id": f"loadtest-{worker}"})
+        # Some texts repeat across requests, so the audio cache sees hits as well as misses
+        start = n % len(self.sentences)
+        text = " ".join(self.sentences[start:start + 3])
+        return await client.post("/generate_audio", data={"text": text, "speaker": "en_0", "codec": "wav"})
+
+
+async def drive(service, url, workload, concurrency, duration):
+    latencies, errors, prepared = [], 0, 0
+    started = asyncio.Event()
+    clock = {}
+
+    async def client_loop(worker):
+        nonlocal errors, prepared
+        async with httpx.AsyncClient(base_url=url, timeout=300) as client:
+            await workload.setup(service, client, worker)
+            prepared += 1
+            if prepared == concurrency:
+                # The clock starts once every client is set up
+                clock["start"] = time.perf_counter()
+                started.set()
+            await started.wait()
+            deadline = clock["start"] + duration
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = await workload.request(service, client, worker)
+                    failed = response.status_code >= 400
+                except httpx.HTTPError:
+                    failed = True
+                if failed:
+                    errors += 1
+                else:
+                    latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(client_loop(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - clock["start"]
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p95_ms": _percentile(latencies, 95) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+    }
+
+
+def stage_means(url):
+    """Mean seconds and count per stage, from the service's /metrics."""
+    sums, counts = {}, {}
+    for line in httpx.get(f"{url}/metrics", timeout=30).text.splitlines():
+        match = STAGE_LINE.match(line)
+        if match:
+            kind, stage, value = match.groups()
+            (sums if kind == "sum" else counts)[stage] = float(value)
+    return {stage: {"count": int(count), "mean_ms": sums.get(stage, 0.0) / count * 1000}
+            for stage, count in sorted(counts.items()) if count}
+
+
+def start_service(service, port, args, log_dir):
+    command = [sys.executable, os.path.join(HERE, "serve_stubbed.py"), service, "--port", str(port),
+               "--site-latency", str(args.site_latency), "--token-delay", str(args.token_delay)]
+    if args.stub_models:
+        command.append("--stub-models")
+    log = open(os.path.join(log_dir, f"{service}.log"), "w")
+    return subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT), log.name
+
+
+def wait_ready(url, process, timeout):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            return False
+        try:
+            if httpx.get(f"{url}/health/ready", timeout=5).status_code == 200:
+                return True
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    return False
+
+
+def print_result(service, result, baseline):
+    line = (f"{service:<9} {result['requests']:>8} {result['errors']:>7} {result['rps']:>8.2f} "
+            f"{result['p50_ms']:>8.0f} {result['p95_ms']:>8.0f} {result['p99_ms']:>8.0f}")
+    if baseline and baseline.get("rps"):
+        line += (f"   req/s {100 * (result['rps'] / baseline['rps'] - 1):+.1f}%"
+                 f", p95 {result['p95_ms'] - baseline['p95_ms']:+.0f} ms")
+    print(line)
+    for stage, stats in result["stages"].items():
+        print(f"{'':<9} {stage:<24} {stats['count']:>8} x {stats['mean_ms']:>9.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--services", default=",".join(SERVICES))
+    parser.add_argument("--concurrency", type=int, default=4, help="clients per service")
+    parser.add_argument("--duration", type=float, default=30, help="seconds per service")
+    parser.add_argument("--articles", type=int, default=3, help="articles per site per scrape request")
+    parser.add_argument("--base-port", type=int, default=8101)
+    parser.add_argument("--stub-models", action="store_true", help="replace BART, the embeddings and Silero too")
+    parser.add_argument("--site-latency", type=float, default=100, help="ms added to every fixture response")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="seconds per stand-in LLM token")
+    parser.add_argument("--ready-timeout", type=float, default=600, help="seconds to wait for model loading")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", help="results file of an earlier run to compare with")
+    args = parser.parse_args()
+
+    services = [s for s in args.services.split(",") if s]
+    unknown = set(services) - set(SERVICES)
+    if unknown:
+        sys.exit(f"Unknown services {sorted(unknown)}; choose from {list(SERVICES)}")
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["services"]
+
+    workload = Workload(fixture_sentences(), args.articles)
+    log_dir = tempfile.mkdtemp(prefix="loadtest-logs-")
+    results = {}
+    print(f"{args.concurrency} clients per service for {args.duration:.0f}s"
+          f"{', stub models' if args.stub_models else ''}; service logs in {log_dir}")
+    print(f"{'service':<9} {'requests':>8} {'errors':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for service in services:
+        port = args.base_port + SERVICES.index(service)
+        url = f"http://127.0.0.1:{port}"
+        process, log = start_service(service, port, args, log_dir)
+        try:
+            if not wait_ready(url, process, args.ready_timeout):
+                print(f"{service:<9} did not become ready, see {log}")
+                continue
+            result = asyncio.run(drive(service, url, workload, args.concurrency, args.duration))
+            result["stages"] = stage_means(url)
+            results[service] = result
+            print_result(service, result, baseline.get(service))
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"concurrency": args.concurrency, "duration": args.duration,
+                       "stub_models": args.stub_models, "services": results}, f, indent=2)
+    if len(results) < len(services):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
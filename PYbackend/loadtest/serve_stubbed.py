@@ -0,0 +1,157 @@
+"""Run one service with its external dependencies replaced by local stand-ins, for load tests.
+
+    cd PYbackend
+    python loadtest/serve_stubbed.py scrapers --port 8101 [--stub-models]
+
+scrapers: searches return links to the saved HTML fixtures, served locally
+    with ``--site-latency`` ms per response, and articles are read from them
+    by the HTTP scrapers; no browser is launched and no site is contacted.
+chatbot: answers come from the stand-in LLM of ``bench_query_stream.py``
+    (fixed delay per token), so no Groq key or network is needed.
+tts: unchanged apart from its audio cache.
+
+With ``--stub-models`` the models are replaced too (BART by a summarizer
+with a fixed cost per batch, the embedding model by ``StubEmbeddings``,
+Silero by ``StubModel``), so the run measures the services rather than the
+models and none of the services imports torch. Stores, caches and indexes go
+to a temporary directory, so every run starts cold.
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+from urllib.parse import quote_plus
+
+PYBACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVICE_DIRS = {"scrapers": "scrapers", "chatbot": "ChatBot", "tts": "TTS"}
+# Medium has no fixture of its own; its links are served from the dev.to page
+FIXTURE_PAGES = {"devto": "devto", "medium": "devto", "wix": "wix"}
+
+
+def enter(service):
+    """Make ``service``'s modules and benchmarks importable by plain name, as when run from its directory."""
+    directory = os.path.join(PYBACKEND, SERVICE_DIRS[service])
+    sys.path[:0] = [directory, os.path.join(directory, "benchmarks")]
+    sys.path.append(PYBACKEND)  # common/
+
+
+class StubTokenizer:
+    """Whitespace tokenizer with the parts of the transformers API the chunker uses."""
+    model_max_length = 1024
+
+    def num_special_tokens_to_add(self):
+        return 2
+
+    def __call__(self, texts, add_special_tokens=False, **kwargs):
+        return {"input_ids": [text.split() for text in texts]}
+
+    def decode(self, ids, skip_special_tokens=True):
+        return " ".join(ids)
+
+
+def stub_summarizer(batch_cost=0.05, per_input=0.02):
+    """Summarizer with a fixed cost per batch plus a smaller cost per input; returns each input's first 30 words."""
+    def summarize(texts, **kwargs):
+        texts = [texts] if isinstance(texts, str) else list(texts)
+        time.sleep(batch_cost + per_input * len(texts))
+        return [{"summary_text": " ".join(text.split()[:30])} for text in texts]
+    summarize.tokenizer = StubTokenizer()
+    return summarize
+
+
+def serve_scrapers(state_dir, stub_models, site_latency):
+    os.environ["ARTICLE_STORE_DB"] = ""
+    os.environ["SUMMARY_CACHE_DB"] = ""
+    os.environ["SCRAPER_POOL_WARM"] = "0"
+    os.environ.setdefault("SUMMARY_ONNX_DIR", os.path.join(state_dir, "onnx"))
+    enter("scrapers")
+    from bench_article_budget import serve_slow_fixtures
+    from scraper_factory import ScraperFactory
+    from devto_http_scraper import DevtoHttpScraper
+    from wix_http_scraper import WixHttpScraper
+    import api
+
+    _, base = serve_slow_fixtures(site_latency / 1000)
+    readers = {"devto": DevtoHttpScraper, "wix": WixHttpScraper}
+
+    class FixtureScraper:
+        """Search links point at the local fixture pages; articles are parsed by the HTTP scraper for that page."""
+
+        def __init__(self, site):
+            self.site = site
+            self.page = FIXTURE_PAGES[site]
+            self.reader = readers[self.page]()
+
+        def get_links(self, keyword):
+            time.sleep(site_latency / 1000)
+            # Distinct URLs per keyword, so every request reads its articles instead of hitting the store
+            return [f"{base}/{self.page}_article.html?site={self.site}&q={quote_plus(keyword)}&n={i}"
+                    for i in range(10)]
+
+        def get_article(self, url):
+            return self.reader.get_article(url)
+
+        def quit(self):
+            self.reader.quit()
+
+    ScraperFactory.create_scraper = staticmethod(lambda site, engine=None: FixtureScraper(site))
+    if stub_models:
+        api.load_summary_backend = lambda backend, model_dir: stub_summarizer()
+    return api.app
+
+
+def serve_chatbot(stub_models, token_delay):
+    enter("chatbot")
+    # Also points GROQ_API_KEY, the index directory and the embedding cache at stand-ins before api is imported
+    from bench_query_stream import StandInLLM
+    from bench_embeddings import StubEmbeddings
+    from llm_client import LLMTimer
+    import api
+
+    api.create_llm = lambda *args, **kwargs: StandInLLM(token_delay=token_delay, callbacks=[LLMTimer()])
+    if stub_models:
+        api.create_base_embeddings = lambda: StubEmbeddings()
+    return api.app
+
+
+def serve_tts(state_dir, stub_models):
+    os.environ["TTS_AUDIO_CACHE_DIR"] = os.path.join(state_dir, "audio_cache")
+    if stub_models:
+        # An existing file at the model path skips the download; the stub loader never opens it
+        model_path = os.path.join(state_dir, "stub_model.pt")
+        open(model_path, "wb").close()
+        os.environ["TTS_MODEL_PATH"] = model_path
+    enter("tts")
+    from bench_tts_engine import load_stub
+    import api
+
+    if stub_models:
+        api.engine.loader = load_stub
+    return api.app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("service", choices=sorted(SERVICE_DIRS))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("--stub-models", action="store_true", help="replace BART, the embeddings and Silero too")
+    parser.add_argument("--site-latency", type=float, default=100, help="ms added to every fixture response")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="seconds per stand-in LLM token")
+    args = parser.parse_args()
+
+    state_dir = tempfile.mkdtemp(prefix=f"loadtest-{args.service}-")
+    if args.service == "scrapers":
+        app = serve_scrapers(state_dir, args.stub_models, args.site_latency)
+    elif args.service == "chatbot":
+        app = serve_chatbot(args.stub_models, args.token_delay)
+    else:
+        app = serve_tts(state_dir, args.stub_models)
+
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
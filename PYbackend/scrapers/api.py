@@ -1,11 +1,36 @@
+import time
+_import_start = time.perf_counter()
+
+import os
+import sys
+# PYbackend/ holds the modules the three services share (common/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 import logging
-from fastapi import FastAPI, Query
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from scraper_factory import ScraperFactory
-from transformers import pipeline
-from typing import List, Dict
-from concurrent.futures import ThreadPoolExecutor
+from driver_pool import driver_pool
+from scraper import wait_stats
+from summary_batcher import SummaryBatcher
+from chunking import chunk_text
+from summary_cache import chunk_cache, result_cache, content_key
+from common.model_loader import ModelLoader
+from batch_jobs import BATCH_MAX_KEYWORDS, JobManager
+from article_fetcher import ArticleFetcher, DEFAULT_ARTICLES, MAX_ARTICLES
+from article_store import ARTICLE_STORE_OFFLINE, ArticleStore
+from pydantic import BaseModel, Field
+from summarizer_backends import SUMMARY_BACKEND, load_summary_backend, summary_model_id
+from common.tracing import render_metrics, span, trace_requests, with_context
+from typing import List, Dict, Union
+from concurrent.futures import ThreadPoolExecutor, Future
 import threading
+import asyncio
+import json
+
+# Time spent importing torch/transformers and the scrapers, reported in the startup profile
+IMPORT_SECONDS = time.perf_counter() - _import_start
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -13,6 +38,16 @@ logger = logging.getLogger(__name__)
 
 app = FastAPI()
 
+SUPPORTED_SITES = ["medium", "wix", "devto"]
+
+# Hierarchical (map-reduce) summarization: output size bound and maximum reduce depth
+HIERARCHICAL_TARGET_TOKENS = int(os.getenv("SUMMARY_TARGET_TOKENS", "250"))
+HIERARCHICAL_MAX_LEVELS = int(os.getenv("SUMMARY_MAX_LEVELS", "4"))
+
+# Shared executors: blocking scrape/summarize work runs here so the event loop stays free
+scrape_executor = ThreadPoolExecutor(max_workers=int(os.getenv("SCRAPE_WORKERS", "6")), thread_name_prefix="scrape")
+summarize_executor = ThreadPoolExecutor(max_workers=int(os.getenv("SUMMARIZE_WORKERS", "3")), thread_name_prefix="summarize")
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -20,68 +55,397 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
+# Stage timings of every request go to /metrics and to its Server-Timing header
+app.middleware("http")(trace_requests)
+
+@app.on_event("startup")
+async def startup_event():
+    # Model weights, warm-up and browsers load in the background; /health/ready reports progress
+    model_loader.start()
+
+@app.on_event("shutdown")
+def shutdown_event():
+    job_manager.cancel_all()
+    article_fetcher.shutdown()
+    scrape_executor.shutdown(wait=False, cancel_futures=True)
+    summarize_executor.shutdown(wait=False, cancel_futures=True)
+    driver_pool.shutdown()
+    summary_batcher.shutdown()
+    if article_store is not None:
+        article_store.close()
+
+# Summarizer, loaded in the background by model_loader; every chunk goes through the shared batcher.
+# SUMMARY_BACKEND picks baseline, int8, distilled or onnx (see summarizer_backends.py)
+# Local snapshot of the backend's model (python -m common.model_loader facebook/bart-large-cnn <dir>);
+# together with HF_HUB_OFFLINE=1 the service starts without network access
+SUMMARY_MODEL_DIR = os.getenv("SUMMARY_MODEL_DIR", "")
+SUMMARY_MODEL = summary_model_id(SUMMARY_BACKEND, SUMMARY_MODEL_DIR)
+summarizer = None
+summary_batcher = SummaryBatcher(None)
+
+def load_summarizer():
+    global summarizer
+    summarizer = load_summary_backend(SUMMARY_BACKEND, SUMMARY_MODEL_DIR)
+    summary_batcher.summarizer = summarizer
+
+def warm_up_summarizer():
+    # One real forward pass, so the first request does not pay for lazy initialization
+    summary_batcher.summarize("The service loads its model in the background and warms it up before "
+                              "reporting that it is ready to summarize articles.", max_length=30, min_length=5)
+
+# Articles and searches read so far; opened at startup, so importing this module creates no database file
+article_store = None
+
+def open_article_store():
+    global article_store
+    article_store = ArticleStore()
+
+model_loader = ModelLoader("scrapers")
+model_loader.profile["import_seconds"] = IMPORT_SECONDS
+model_loader.add_step("article_store", open_article_store)
+model_loader.add_step("load", load_summarizer)
+model_loader.add_step("warm_up", warm_up_summarizer)
+# Launch the pooled browsers before the first request instead of per scrape (none are used offline)
+if not ARTICLE_STORE_OFFLINE:
+    model_loader.add_step("browsers", driver_pool.warm_up)
+
+def require_ready():
+    if not model_loader.ready:
+        raise HTTPException(status_code=503, detail=f"Summarizer is {model_loader.state}, retry shortly",
+                            headers={"Retry-After": "5"})
+
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+def submit_chunk(text: str, max_length: int = 100, min_length: int = 30) -> Future:
+    """Queue one chunk on the shared batcher; empty or too-short chunks resolve immediately."""
+    if not text.strip():
+        return _resolved("No valid content.")
+    if len(text.split()) < 5:
+        return _resolved("Too short to summarize.")
+
+    # Identical chunks are summarized once: served from the cache, or joined to the in-flight future
+    key = content_key(SUMMARY_MODEL, max_length, min_length, text)
+    cached = chunk_cache.get(key)
+    if cached is not None:
+        return _resolved(cached)
+    with _in_flight_lock:
+        future = _in_flight.get(key)
+        submitted = future is None
+        if submitted:
+            future = summary_batcher.submit(text, max_length=max_length, min_length=min_length)
+            _in_flight[key] = future
+    if submitted:
+        # Outside the lock: a future that is already done runs the callback inline, and it takes the lock
+        future.add_done_callback(lambda f: _chunk_done(key, f))
+    return future
 
-# Initialize summarizer
-summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
+def _chunk_done(key: str, future: Future):
+    with _in_flight_lock:
+        _in_flight.pop(key, None)
+    if future.exception() is None:
+        chunk_cache.set(key, future.result())
 
-def chunk_text(text: str, max_chunk_size: int = 3000) -> List[str]:
-    return [text[i:i + max_chunk_size] for i in range(0, len(text), max_chunk_size)]
+def chunk_result(future: Future) -> str:
+    try:
+        return future.result()
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+def _resolved(value: str) -> Future:
+    future = Future()
+    future.set_result(value)
+    return future
+
+def successful_results(futures: List[Future]) -> List[str]:
+    """Summaries of the futures that succeeded, so errors are not fed into the next level."""
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as e:
+            logger.error(f"Chunk summarization failed: {e}")
+    return results
 
 def summarize_chunk(text: str, max_length: int = 100, min_length: int = 30) -> str:
     try:
-        if not text.strip():
-            return "No valid content."
-        if len(text.split()) < 5:
-            return "Too short to summarize."
-        result = summarizer(text, max_length=max_length, min_length=min_length, do_sample=False)
-        return result[0]["summary_text"]
+        return chunk_result(submit_chunk(text, max_length, min_length))
     except Exception as e:
         return f"Error: {str(e)}"
 
-def summarize_content(text: str, max_length: int = 100, min_length: int = 30) -> str:
+def count_tokens(text: str) -> int:
+    return len(summarizer.tokenizer([text], add_special_tokens=False)["input_ids"][0])
+
+def summarize_content(text: str, max_length: int = 100, min_length: int = 30, stats: Dict = None,
+                      hierarchical: bool = False, target_tokens: int = HIERARCHICAL_TARGET_TOKENS) -> str:
+    """Summarize ``text`` chunk by chunk; token accounting is written into ``stats`` when given.
+
+    With ``hierarchical`` the chunk summaries are re-chunked and summarized
+    again, level by level, until the result fits in ``target_tokens``.
+    """
     if not text or not text.strip():
         return "No valid content provided."
     if len(text) < 200:
         return summarize_chunk(text, max_length, min_length)
-    chunks = chunk_text(text)
-    with ThreadPoolExecutor(max_workers=min(6, len(chunks))) as executor:
-        summaries = list(executor.map(lambda chunk: summarize_chunk(chunk, max_length, min_length), chunks))
-    return " ".join(summaries)
+    with span("chunking"):
+        chunks, chunk_stats = chunk_text(text, summarizer.tokenizer)
+    if stats is not None:
+        stats.update(chunk_stats)
+    # Submit every chunk up front so they can share batches with each other and with other requests
+    futures = [submit_chunk(chunk, max_length, min_length) for chunk in chunks]
+    if not hierarchical:
+        return " ".join(chunk_result(future) for future in futures)
 
-def scrape_site(site: str, keyword: str, output: Dict):
-    bot = None
+    summaries = successful_results(futures)
+    if not summaries:
+        return " ".join(chunk_result(future) for future in futures)
+    combined = " ".join(summaries)
+    levels = 1
+    while levels < HIERARCHICAL_MAX_LEVELS and count_tokens(combined) > target_tokens:
+        levels += 1
+        chunks, _ = chunk_text(combined, summarizer.tokenizer)
+        if len(chunks) == 1:
+            # Everything fits in one pass: produce the final summary at the target length
+            combined = summarize_chunk(chunks[0], max_length=target_tokens,
+                                       min_length=min(min_length, target_tokens // 2))
+            break
+        # Reduce step: chunks of the same level are independent and are batched together
+        futures = [submit_chunk(chunk, max_length, min_length) for chunk in chunks]
+        combined = " ".join(successful_results(futures)) or combined
+    if stats is not None:
+        stats["levels"] = levels
+    return combined
+
+def scrape_site(site: str, keyword: str, output: Dict = None, articles: int = DEFAULT_ARTICLES) -> Dict:
+    """Find up to ``articles`` links for ``keyword`` and read them concurrently into one site result."""
     try:
         logger.info(f"Scraping {site} for keyword: {keyword} in thread: {threading.current_thread().name}")
-        bot = ScraperFactory.create_scraper(site)
-        bot.get_data(keyword)
-        data = bot.data
-        if isinstance(data, list):
-            combined_text = " ".join(item.get("content", "") for item in data if isinstance(item, dict) and item.get("content"))
-            sources = [
-                {"url": item.get("url", ""), "title": item.get("title", item.get("content", "")[:50] + "..."), "website": site}
-                for item in data if isinstance(item, dict) and item.get("url")
-            ]
+        links = load_links(site, keyword)[:articles]
+        items = [item for item in load_articles(site, links) if item.get("content", "").strip()]
+        if not links:
+            result = {"error": "No links found for this keyword", "sources": []}
+        elif not items:
+            result = {"error": "No valid content scraped", "sources": []}
         else:
-            combined_text = str(data)
-            sources = []
-        output[site] = {"content": combined_text, "sources": sources}
+            result = {
+                "content": " ".join(item["content"] for item in items),
+                "sources": [
+                    {"url": item["url"], "title": item.get("title", item["content"][:50] + "..."), "website": site}
+                    for item in items
+                ],
+            }
     except Exception as e:
         logger.error(f"Error scraping {site}: {str(e)}")
-        output[site] = {"error": str(e), "sources": []}
+        result = {"error": str(e), "sources": []}
+    if output is not None:
+        output[site] = result
+    return result
+
+def summarize_site(site: str, data: Dict, hierarchical: bool = False,
+                   target_tokens: int = HIERARCHICAL_TARGET_TOKENS) -> Dict:
+    """Turn one site's scraped data into its entry in the response ``results``."""
+    if "content" in data and data["content"].strip():
+        stats = {}
+        # Chunking, waiting for a batch slot and the site's share of BART inference
+        with span("summarize"):
+            summary = summarize_content(data["content"], stats=stats, hierarchical=hierarchical,
+                                        target_tokens=target_tokens)
+        return {
+            "summary": summary,
+            "sources": data.get("sources", []),
+            "tokens": {key: stats[key] for key in ("chunks", "levels", "tokens_processed", "tokens_dropped")
+                       if key in stats}
+        }
+    return {
+        "error": data.get("error", "No valid content scraped"),
+        "sources": []
+    }
+
+def fetch_links(site: str, keyword: str) -> List[str]:
+    bot = ScraperFactory.create_scraper(site)
+    try:
+        with span("get_links"):
+            # Some scrapers report a failed search as an error entry instead of raising
+            return [link for link in bot.get_links(keyword) if isinstance(link, str)]
+    finally:
+        bot.quit()
+
+def fetch_article(site: str, url: str) -> Dict:
+    bot = ScraperFactory.create_scraper(site)
+    try:
+        with span("article_render"):
+            return bot.get_article(url)
+    finally:
+        bot.quit()
+
+def summarize_article(content: str, hierarchical: bool = False,
+                      target_tokens: int = HIERARCHICAL_TARGET_TOKENS):
+    stats = {}
+    summary = summarize_content(content, stats=stats, hierarchical=hierarchical, target_tokens=target_tokens)
+    return summary, {key: stats[key] for key in ("chunks", "levels", "tokens_processed", "tokens_dropped")
+                     if key in stats}
+
+# Every article of a site's budget is read on its own worker, capped per site across requests
+article_fetcher = ArticleFetcher(fetch_article)
+
+def load_links(site: str, keyword: str) -> List[str]:
+    """Links from a fresh stored search for ``keyword``, otherwise searched on the site and stored."""
+    links = article_store.get_links(site, keyword)
+    if links is None:
+        if article_store.offline:
+            return []
+        links = fetch_links(site, keyword)
+        if links:
+            article_store.put_links(site, keyword, links)
+    return links
+
+def _or_stale(article: Dict, stale: Dict) -> Dict:
+    """``article`` as read, or the stale stored copy when reading it again failed."""
+    if stale is None or article.get("content", "").strip():
+        return article
+    logger.warning(f"Reading {stale['url']} again failed ({article.get('error', 'no content')}), "
+                   f"serving the stored copy")
+    return stale
+
+def load_articles(site: str, urls: List[str]) -> List[Dict]:
+    """Articles for ``urls`` in order: fresh ones from the store, the rest read concurrently and stored."""
+    with span("store_lookup"):
+        stored = article_store.get_many(site, urls, include_stale=True)
+    fresh = {url: article for url, article in stored.items() if not article.get("stale")}
+    missing = [url for url in urls if url not in fresh]
+    if article_store.offline:
+        fetched = {url: {"url": url, "error": "Not in the article store (offline)"} for url in missing}
+    else:
+        articles = article_fetcher.fetch(site, missing)
+        article_store.put_many(site, articles)
+        fetched = {url: _or_stale(article, stored.get(url)) for url, article in zip(missing, articles)}
+    logger.info(f"{site}: {len(fresh)} of {len(urls)} article(s) served from the store")
+    return [fresh[url] if url in fresh else fetched[url] for url in urls]
+
+def load_article(site: str, url: str) -> Dict:
+    stored = article_store.get_many(site, [url], include_stale=True).get(url)
+    if stored is not None and not stored.get("stale"):
+        return stored
+    if article_store.offline:
+        raise LookupError(f"{url} is not in the article store (offline)")
+    try:
+        article = fetch_article(site, url)
+    except Exception as e:
+        if stored is None:
+            raise
+        article = {"url": url, "error": str(e)}
+    article_store.put_many(site, [article])
+    return _or_stale(article, stored)
+
+# Batch jobs share the executors, the per-site limits and the summary batcher across every keyword
+job_manager = JobManager(load_links, load_article, summarize_article, scrape_executor, summarize_executor)
+
+class BatchRequest(BaseModel):
+    keywords: List[str] = Field(..., min_length=1)
+    sites: Union[List[str], str] = "medium"  # list or comma-separated string
+    hierarchical: bool = False
+    target_tokens: int = Field(HIERARCHICAL_TARGET_TOKENS, ge=30, le=1000)
+    articles: int = Field(DEFAULT_ARTICLES, ge=1, le=MAX_ARTICLES)
+
+async def process_site(site: str, keyword: str, hierarchical: bool = False,
+                       target_tokens: int = HIERARCHICAL_TARGET_TOKENS, articles: int = DEFAULT_ARTICLES):
+    # Each site goes to summarization as soon as its own scrape finishes
+    # Summaries differ per backend, so switching SUMMARY_BACKEND must not serve another backend's results
+    key = f"{' '.join(keyword.lower().split())}|{site}|articles:{articles}|model:{SUMMARY_MODEL}"
+    if hierarchical:
+        key += f"|hierarchical:{target_tokens}"
+    cached = result_cache.get(key)
+    if cached is not None:
+        return site, cached
+    loop = asyncio.get_running_loop()
+    data = await loop.run_in_executor(scrape_executor, with_context(scrape_site, site, keyword, articles=articles))
+    result = await loop.run_in_executor(
+        summarize_executor, with_context(summarize_site, site, data, hierarchical, target_tokens)
+    )
+    if "summary" in result:
+        result_cache.set(key, result)
+    return site, result
+
+async def iter_site_results(keyword: str, site_list: List[str], hierarchical: bool = False,
+                            target_tokens: int = HIERARCHICAL_TARGET_TOKENS, articles: int = DEFAULT_ARTICLES):
+    """Yield ``(site, result, elapsed_seconds)`` in completion order without blocking the event loop."""
+    start = time.perf_counter()
+    tasks = [asyncio.create_task(process_site(site, keyword, hierarchical, target_tokens, articles))
+             for site in site_list]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            site, result = await next_done
+            yield site, result, time.perf_counter() - start
     finally:
-        if bot:
-            bot.quit()
+        for task in tasks:
+            task.cancel()
+
+def token_totals(results) -> Dict:
+    """Tokens summarized vs. truncated across all sites of a request."""
+    processed = sum(r.get("tokens", {}).get("tokens_processed", 0) for r in results)
+    dropped = sum(r.get("tokens", {}).get("tokens_dropped", 0) for r in results)
+    return {"tokens_processed": processed, "tokens_dropped": dropped}
+
+def parse_sites(sites: str):
+    """Split the ``sites`` query parameter into (valid, invalid) site lists."""
+    site_list = list(dict.fromkeys(s.strip().lower() for s in sites.split(",") if s.strip()))
+    invalid_sites = [s for s in site_list if s not in SUPPORTED_SITES]
+    return site_list, invalid_sites
+
+@app.get("/health/live")
+async def health_live():
+    # The process is up and serving; model loading may still be in progress
+    return {"status": "alive", "state": model_loader.state}
+
+@app.get("/health/ready")
+async def health_ready():
+    status = model_loader.status()
+    return JSONResponse(status_code=200 if model_loader.ready else 503, content=status)
+
+@app.get("/metrics")
+async def metrics():
+    # Prometheus text format: per-stage and per-route latency histograms
+    return PlainTextResponse(render_metrics("scrapers"), media_type="text/plain; version=0.0.4")
+
+@app.get("/pool/status")
+async def pool_status():
+    return driver_pool.status()
+
+@app.get("/scrapers/wait-stats")
+async def scraper_wait_stats():
+    # Per-site readiness wait latency vs. the fixed sleeps that used to be there
+    return wait_stats.snapshot()
+
+@app.get("/scrapers/article-stats")
+async def scraper_article_stats():
+    return article_fetcher.metrics()
+
+@app.get("/scrapers/store-stats")
+async def scraper_store_stats():
+    require_ready()
+    return article_store.metrics()
+
+@app.get("/summarizer/stats")
+async def summarizer_stats():
+    return {"backend": SUMMARY_BACKEND, "model": SUMMARY_MODEL, **summary_batcher.metrics()}
+
+@app.get("/cache/stats")
+async def cache_stats():
+    return {"chunks": chunk_cache.metrics(), "results": result_cache.metrics()}
 
 @app.get("/scrape-and-summarize")
 async def scrape_and_summarize(
     keyword: str,
-    sites: str = Query("medium", description="Comma-separated list of sites")
+    sites: str = Query("medium", description="Comma-separated list of sites"),
+    hierarchical: bool = Query(False, description="Re-summarize chunk summaries until they fit target_tokens"),
+    target_tokens: int = Query(HIERARCHICAL_TARGET_TOKENS, ge=30, le=1000),
+    articles: int = Query(DEFAULT_ARTICLES, ge=1, le=MAX_ARTICLES, description="Articles read per site")
 ):
+    require_ready()
     logger.info(f"Received request for keyword: {keyword}, sites: {sites}")
-    site_list = [s.strip().lower() for s in sites.split(",")]
-    supported_sites = ["medium", "wix", "devto"]
-    invalid_sites = [s for s in site_list if s not in supported_sites]
+    site_list, invalid_sites = parse_sites(sites)
     if invalid_sites:
         logger.warning(f"Invalid sites requested: {invalid_sites}")
         return {
@@ -89,31 +453,94 @@ async def scrape_and_summarize(
             "results": {site: {"error": "Unsupported site", "sources": []} for site in invalid_sites}
         }
 
-    scraped_data = {}
-    # Scrape sites in parallel
-    with ThreadPoolExecutor(max_workers=len(site_list)) as executor:
-        futures = [executor.submit(scrape_site, site, keyword, scraped_data) for site in site_list]
-        for future in futures:
-            future.result()  # Wait for all threads to complete
-    logger.info(f"Scraping completed for sites: {site_list}")
-
     summary_results = {}
-    with ThreadPoolExecutor(max_workers=len(site_list)) as executor:
-        futures = []
-        for site, data in scraped_data.items():
-            if "content" in data and data["content"].strip():
-                summary_results[site] = {
-                    "summary": summarize_content(data["content"]),
-                    "sources": data.get("sources", [])
-                }
-            else:
-                summary_results[site] = {
-                    "error": data.get("error", "No valid content scraped"),
-                    "sources": []
-                }
+    time_to_first_result = None
+    elapsed = 0.0
+    async for site, result, elapsed in iter_site_results(keyword, site_list, hierarchical, target_tokens, articles):
+        if time_to_first_result is None:
+            time_to_first_result = elapsed
+        summary_results[site] = result
+        logger.info(f"{site} finished after {elapsed:.2f}s")
 
     logger.info(f"Returning summary results for keyword: {keyword}")
     return {
         "keyword": keyword,
-        "results": summary_results
-    }
\ No newline at end of file
+        "results": {site: summary_results[site] for site in site_list},
+        "metadata": {
+            "time_to_first_result": time_to_first_result,
+            "total_time": elapsed,
+            **token_totals(summary_results.values())
+        }
+    }
+
+@app.post("/jobs")
+async def create_job(request: BatchRequest):
+    """Start a batch of keywords x sites; poll /jobs/{job_id} or stream /jobs/{job_id}/stream."""
+    require_ready()
+    keywords = list(dict.fromkeys(" ".join(k.split()) for k in request.keywords if k.strip()))
+    if not keywords or len(keywords) > BATCH_MAX_KEYWORDS:
+        raise HTTPException(status_code=400, detail=f"Provide 1 to {BATCH_MAX_KEYWORDS} keywords")
+    sites = request.sites if isinstance(request.sites, str) else ",".join(request.sites)
+    site_list, invalid_sites = parse_sites(sites)
+    if invalid_sites or not site_list:
+        raise HTTPException(status_code=400, detail=f"Unsupported sites: {invalid_sites}. Supported: {SUPPORTED_SITES}")
+    job = job_manager.submit(keywords, site_list, request.hierarchical, request.target_tokens, request.articles)
+    logger.info(f"Started batch job {job.id}: {len(keywords)} keywords x {site_list}")
+    return {"job_id": job.id, "status": job.status,
+            "poll": f"/jobs/{job.id}", "stream": f"/jobs/{job.id}/stream"}
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return job.snapshot()
+
+@app.get("/jobs/{job_id}/stream")
+async def stream_job(job_id: str):
+    """NDJSON: one line per finished (keyword, site) pair, replayed from the start, then a done line."""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+
+    async def events():
+        async for event in job_manager.events(job):
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+@app.get("/scrape-and-summarize/stream")
+async def scrape_and_summarize_stream(
+    keyword: str,
+    sites: str = Query("medium", description="Comma-separated list of sites"),
+    hierarchical: bool = Query(False, description="Re-summarize chunk summaries until they fit target_tokens"),
+    target_tokens: int = Query(HIERARCHICAL_TARGET_TOKENS, ge=30, le=1000),
+    articles: int = Query(DEFAULT_ARTICLES, ge=1, le=MAX_ARTICLES, description="Articles read per site")
+):
+    """Same as /scrape-and-summarize, but streams one NDJSON line per site as soon as it is ready."""
+    require_ready()
+    logger.info(f"Received streaming request for keyword: {keyword}, sites: {sites}")
+    site_list, invalid_sites = parse_sites(sites)
+
+    async def events():
+        time_to_first_result = None
+        elapsed = 0.0
+        results = []
+        for site in invalid_sites:
+            yield json.dumps({"type": "result", "keyword": keyword, "site": site,
+                              "result": {"error": "Unsupported site", "sources": []}}) + "\n"
+        valid_sites = [s for s in site_list if s not in invalid_sites]
+        async for site, result, elapsed in iter_site_results(keyword, valid_sites, hierarchical, target_tokens,
+                                                              articles):
+            if time_to_first_result is None:
+                time_to_first_result = elapsed
+            results.append(result)
+            yield json.dumps({"type": "result", "keyword": keyword, "site": site,
+                              "result": result, "elapsed": elapsed}) + "\n"
+        yield json.dumps({"type": "done", "keyword": keyword, "metadata": {
+            "time_to_first_result": time_to_first_result,
+            "total_time": elapsed,
+            **token_totals(results)
+        }}) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
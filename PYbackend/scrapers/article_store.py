@@ -0,0 +1,179 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from summary_cache import content_key
+from site_config import parse_site_seconds
+
+logger = logging.getLogger(__name__)
+
+# SQLite file holding every article read so far; empty keeps the store in memory for this process only
+ARTICLE_STORE_DB = os.getenv("ARTICLE_STORE_DB", "article_store.sqlite3")
+# Seconds an article stays fresh, with per-site overrides such as "medium=86400"
+ARTICLE_MAX_AGE = float(os.getenv("ARTICLE_STORE_MAX_AGE", str(7 * 24 * 3600)))
+ARTICLE_SITE_MAX_AGE = os.getenv("ARTICLE_STORE_SITE_MAX_AGE", "")
+# Search results change faster than articles, so they expire sooner
+SEARCH_MAX_AGE = float(os.getenv("ARTICLE_STORE_SEARCH_MAX_AGE", str(6 * 3600)))
+# Serve links and articles only from the store, stale or not, and never open the sites
+ARTICLE_STORE_OFFLINE = os.getenv("ARTICLE_STORE_OFFLINE", "0") == "1"
+
+# Query parameters that only track where a click came from
+_TRACKING_PARAMS = {"source", "ref", "fbclid", "gclid"}
+_BATCH = 500  # URLs per IN (...) lookup, below SQLite's variable limit
+
+
+def canonical_url(url: str) -> str:
+    """``url`` without fragment, tracking parameters or trailing slash, with a lowercase scheme and host."""
+    parts = urlsplit(url.strip())
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if not (k.lower().startswith("utm_") or k.lower() in _TRACKING_PARAMS))
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+
+def normalize_keyword(keyword: str) -> str:
+    return " ".join(keyword.lower().split())
+
+
+class ArticleStore:
+    """Extracted articles keyed by canonical URL, plus the links each search returned.
+
+    Mirrors ``BlogLinks`` in ``Database_Schema/simplify.sql`` (one row per
+    unique URL and site) with the content, its hash and when it was fetched.
+    An entry older than its site's max age is stale: ``get_many`` leaves it
+    out so the caller fetches it again (or, with ``include_stale``, returns
+    it marked ``stale`` as a fallback for a failed fetch), except in
+    ``offline`` mode, where whatever is stored is served and nothing is
+    fetched.
+    """
+
+    def __init__(self, db_path: str = ARTICLE_STORE_DB, max_age: float = ARTICLE_MAX_AGE,
+                 site_max_age: str = ARTICLE_SITE_MAX_AGE, search_max_age: float = SEARCH_MAX_AGE,
+                 offline: bool = ARTICLE_STORE_OFFLINE):
+        self.db_path = db_path
+        self.max_age = max_age
+        self.site_max_age = parse_site_seconds(site_max_age)
+        self.search_max_age = search_max_age
+        self.offline = offline
+        self._lock = threading.Lock()
+        self.stats = {"lookups": 0, "hits": 0, "stale": 0, "misses": 0, "stored": 0, "changed": 0,
+                      "search_hits": 0, "search_misses": 0}
+        self._db = sqlite3.connect(db_path or ":memory:", check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS articles (url TEXT PRIMARY KEY, site TEXT, title TEXT, content TEXT, "
+            "content_hash TEXT, fetched_at REAL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS searches (site TEXT, keyword TEXT, links TEXT, fetched_at REAL, "
+            "PRIMARY KEY (site, keyword))"
+        )
+        self._db.commit()
+        logger.info(f"Article store at {db_path or 'memory'} (offline: {offline})")
+
+    def get_many(self, site: str, urls: Iterable[str], include_stale: bool = False) -> Dict[str, Dict]:
+        """Fresh stored articles for ``urls`` (all stored ones when offline), keyed by the URLs as given.
+
+        With ``include_stale`` stale articles are returned too, with ``"stale": True``; they still
+        count as misses.
+        """
+        by_canonical = {}
+        for url in urls:
+            by_canonical.setdefault(canonical_url(url), []).append(url)
+        keys = list(by_canonical)
+        now = time.time()
+        max_age = self.site_max_age.get(site, self.max_age)
+        found = {}
+        fresh = 0
+        with self._lock:
+            for i in range(0, len(keys), _BATCH):
+                batch = keys[i:i + _BATCH]
+                rows = self._db.execute(
+                    f"SELECT url, title, content, content_hash, fetched_at FROM articles "
+                    f"WHERE url IN ({', '.join('?' * len(batch))})", batch
+                ).fetchall()
+                for url, title, content, content_hash, fetched_at in rows:
+                    stale = not self.offline and now - fetched_at > max_age
+                    if stale:
+                        self.stats["stale"] += 1
+                        if not include_stale:
+                            continue
+                    else:
+                        fresh += 1
+                    # Every variant the caller asked for maps to the row, each with its own URL
+                    for requested in by_canonical[url]:
+                        article = {"url": requested, "content": content, "content_hash": content_hash,
+                                   "fetched_at": fetched_at, "from_store": True}
+                        if title:
+                            article["title"] = title
+                        if stale:
+                            article["stale"] = True
+                        found[requested] = article
+            self.stats["lookups"] += len(keys)
+            self.stats["hits"] += fresh
+            self.stats["misses"] += len(keys) - fresh
+        return found
+
+    def put_many(self, site: str, articles: List[Dict]):
+        """Store articles that have content; an unchanged hash only refreshes ``fetched_at``."""
+        now = time.time()
+        rows = [(canonical_url(a["url"]), site, a.get("title"), a["content"], content_key(a["content"]), now)
+                for a in articles if a.get("url") and a.get("content", "").strip()]
+        if not rows:
+            return
+        with self._lock:
+            previous = {}
+            for i in range(0, len(rows), _BATCH):
+                batch = [row[0] for row in rows[i:i + _BATCH]]
+                previous.update(self._db.execute(
+                    f"SELECT url, content_hash FROM articles WHERE url IN ({', '.join('?' * len(batch))})", batch
+                ).fetchall())
+            self._db.executemany(
+                "INSERT OR REPLACE INTO articles (url, site, title, content, content_hash, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+            self._db.commit()
+            self.stats["stored"] += len(rows)
+            self.stats["changed"] += sum(1 for row in rows if row[0] in previous and previous[row[0]] != row[4])
+
+    def get_links(self, site: str, keyword: str) -> Optional[List[str]]:
+        """Links a fresh search for ``keyword`` returned (any stored search when offline), or None."""
+        with self._lock:
+            row = self._db.execute("SELECT links, fetched_at FROM searches WHERE site = ? AND keyword = ?",
+                                   (site, normalize_keyword(keyword))).fetchone()
+            if row is None or (not self.offline and time.time() - row[1] > self.search_max_age):
+                self.stats["search_misses"] += 1
+                return None
+            self.stats["search_hits"] += 1
+        return json.loads(row[0])
+
+    def put_links(self, site: str, keyword: str, links: List[str]):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO searches (site, keyword, links, fetched_at) VALUES (?, ?, ?, ?)",
+                (site, normalize_keyword(keyword), json.dumps(links), time.time())
+            )
+            self._db.commit()
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            sites = dict(self._db.execute("SELECT site, COUNT(*) FROM articles GROUP BY site").fetchall())
+            (searches,) = self._db.execute("SELECT COUNT(*) FROM searches").fetchone()
+            lookups = self.stats["lookups"]
+            return {
+                **self.stats,
+                "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+                "articles": sites,
+                "searches": searches,
+                "offline": self.offline,
+                "persistent": bool(self.db_path),
+            }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
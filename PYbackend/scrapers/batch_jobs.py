@@ -0,0 +1,225 @@
+import os
+import time
+import uuid
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Callable, Dict, List
+from site_config import parse_site_limits
+from article_store import canonical_url
+
+logger = logging.getLogger(__name__)
+
+# Concurrent requests per site across all jobs, e.g. "medium=2,devto=6"; other sites use the default
+BATCH_SITE_CONCURRENCY = os.getenv("BATCH_SITE_CONCURRENCY", "")
+BATCH_DEFAULT_SITE_CONCURRENCY = int(os.getenv("BATCH_DEFAULT_SITE_CONCURRENCY", "3"))
+BATCH_MAX_KEYWORDS = int(os.getenv("BATCH_MAX_KEYWORDS", "100"))
+BATCH_MAX_JOBS = int(os.getenv("BATCH_MAX_JOBS", "100"))  # finished jobs kept for polling
+FINISHED = ("done", "failed", "cancelled")
+
+
+class BatchJob:
+    """One batch of keywords x sites, with its results and an event log for streaming."""
+
+    def __init__(self, keywords: List[str], sites: List[str], hierarchical: bool, target_tokens: int,
+                 articles: int = 1):
+        self.id = uuid.uuid4().hex
+        self.keywords = keywords
+        self.sites = sites
+        self.hierarchical = hierarchical
+        self.target_tokens = target_tokens
+        self.articles = articles
+        self.status = "queued"
+        self.error = None
+        self.results: Dict[str, Dict[str, Dict]] = {keyword: {} for keyword in keywords}
+        self.events: List[Dict] = []
+        self.changed = asyncio.Event()
+        self.stats = {"pairs": len(keywords) * len(sites), "pairs_done": 0, "links": 0,
+                      "unique_articles": 0, "duplicate_links": 0, "articles_summarized": 0}
+        self.created = time.time()
+        self._start = None
+        self._cpu_start = None
+        self.metadata = {}
+
+    def emit(self, event: Dict):
+        self.events.append(event)
+        # Wake every streamer, then re-arm for the next event
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    def snapshot(self) -> Dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "error": self.error,
+            "keywords": self.keywords,
+            "sites": self.sites,
+            "progress": dict(self.stats),
+            "results": self.results,
+            "metadata": self.metadata,
+        }
+
+
+class JobManager:
+    """Runs batch jobs with article de-duplication and per-site concurrency limits.
+
+    Every (keyword, site) pair searches for links; each distinct article
+    (by canonical URL) is then fetched and summarized once per job, however
+    many keywords found it, and the summary is shared by every pair that
+    links to it. Searches
+    and fetches for one site wait on that site's semaphore, which is shared
+    by all jobs, so a large batch cannot flood one site. Summaries go
+    through ``summarize`` and so through the service's shared batcher.
+    """
+
+    def __init__(self, get_links: Callable, get_article: Callable, summarize: Callable,
+                 scrape_executor, summarize_executor, site_limits: str = BATCH_SITE_CONCURRENCY,
+                 default_limit: int = BATCH_DEFAULT_SITE_CONCURRENCY, max_jobs: int = BATCH_MAX_JOBS):
+        self.get_links = get_links
+        self.get_article = get_article
+        self.summarize = summarize
+        self.scrape_executor = scrape_executor
+        self.summarize_executor = summarize_executor
+        self.site_limits = parse_site_limits(site_limits)
+        self.default_limit = default_limit
+        self.max_jobs = max_jobs
+        self.jobs: "OrderedDict[str, BatchJob]" = OrderedDict()
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._tasks = set()
+
+    def submit(self, keywords: List[str], sites: List[str], hierarchical: bool = False,
+               target_tokens: int = 250, articles: int = 1) -> BatchJob:
+        job = BatchJob(keywords, sites, hierarchical, target_tokens, articles)
+        self.jobs[job.id] = job
+        self._prune()
+        task = asyncio.create_task(self._run(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def get(self, job_id: str):
+        return self.jobs.get(job_id)
+
+    async def events(self, job: BatchJob):
+        """Yield the job's events from the beginning, then live until it finishes."""
+        sent = 0
+        while True:
+            changed = job.changed
+            while sent < len(job.events):
+                yield job.events[sent]
+                sent += 1
+            if job.status in FINISHED:
+                return
+            await changed.wait()
+
+    def cancel_all(self):
+        for task in list(self._tasks):
+            task.cancel()
+
+    def _semaphore(self, site):
+        if site not in self._semaphores:
+            self._semaphores[site] = asyncio.Semaphore(self.site_limits.get(site, self.default_limit))
+        return self._semaphores[site]
+
+    async def _on_site(self, site, fn, *args):
+        async with self._semaphore(site):
+            return await asyncio.get_running_loop().run_in_executor(self.scrape_executor, fn, site, *args)
+
+    async def _run(self, job: BatchJob):
+        job.status = "running"
+        job._start = time.perf_counter()
+        job._cpu_start = time.process_time()
+        articles: Dict[str, asyncio.Task] = {}
+        try:
+            await asyncio.gather(*[self._run_pair(job, keyword, site, articles)
+                                   for keyword in job.keywords for site in job.sites])
+            job.status = "done"
+        except Exception as e:
+            logger.error(f"Batch job {job.id} failed: {e}")
+            job.status = "failed"
+            job.error = str(e)
+        except asyncio.CancelledError:
+            # Shutdown cancels running jobs; report them as cancelled, not as still running
+            job.status = "cancelled"
+            raise
+        finally:
+            for task in articles.values():
+                task.cancel()
+            elapsed = time.perf_counter() - job._start
+            cpu = time.process_time() - job._cpu_start
+            cores = os.cpu_count() or 1
+            job.metadata = {
+                "total_time": elapsed,
+                "cpu_seconds": cpu,
+                "cores": cores,
+                "articles_per_second": job.stats["articles_summarized"] / elapsed if elapsed else 0.0,
+                # Throughput normalized by the cores the host could have used during the job
+                "articles_per_core_second": job.stats["articles_summarized"] / (elapsed * cores) if elapsed else 0.0,
+            }
+            job.emit({"type": "done", "job_id": job.id, "status": job.status, "error": job.error,
+                      "progress": dict(job.stats), "metadata": job.metadata})
+            logger.info(f"Batch job {job.id} {job.status} in {elapsed:.2f}s: {job.stats}")
+
+    async def _run_pair(self, job: BatchJob, keyword: str, site: str, articles: Dict[str, asyncio.Task]):
+        try:
+            links = (await self._on_site(site, self.get_links, keyword))[:job.articles]
+        except Exception as e:
+            logger.error(f"Link search failed for {keyword} on {site}: {e}")
+            result = {"error": str(e), "sources": []}
+        else:
+            job.stats["links"] += len(links)
+            tasks = []
+            # Keyed on the canonical URL, so tracking parameters or a trailing slash don't refetch an article
+            unique = {}
+            for url in links:
+                unique.setdefault(canonical_url(url), url)
+            for key, url in unique.items():
+                if key in articles:
+                    job.stats["duplicate_links"] += 1
+                else:
+                    job.stats["unique_articles"] += 1
+                    articles[key] = asyncio.create_task(self._article(job, site, url))
+                tasks.append(articles[key])
+            # shield: an article shared with another pair keeps running if this pair is cancelled
+            result = self._pair_result(site, await asyncio.gather(*[asyncio.shield(t) for t in tasks]))
+        job.results[keyword][site] = result
+        job.stats["pairs_done"] += 1
+        job.emit({"type": "result", "job_id": job.id, "keyword": keyword, "site": site, "result": result})
+
+    async def _article(self, job: BatchJob, site: str, url: str) -> Dict:
+        try:
+            article = await self._on_site(site, self.get_article, url)
+        except Exception as e:
+            return {"url": url, "error": str(e)}
+        content = article.get("content", "")
+        if not content.strip():
+            return {"url": url, "error": "No content"}
+        try:
+            summary, tokens = await asyncio.get_running_loop().run_in_executor(
+                self.summarize_executor, self.summarize, content, job.hierarchical, job.target_tokens
+            )
+        except Exception as e:
+            logger.error(f"Summarizing {url} failed: {e}")
+            return {"url": url, "error": str(e)}
+        job.stats["articles_summarized"] += 1
+        return {"url": url, "title": article.get("title", content[:50] + "..."), "summary": summary,
+                "tokens": tokens}
+
+    @staticmethod
+    def _pair_result(site: str, articles: List[Dict]) -> Dict:
+        summarized = [a for a in articles if "summary" in a]
+        if not summarized:
+            return {"error": "No valid content scraped", "sources": []}
+        return {
+            "summary": " ".join(a["summary"] for a in summarized),
+            "sources": [{"url": a["url"], "title": a["title"], "website": site} for a in summarized],
+            "tokens": {
+                "tokens_processed": sum(a["tokens"].get("tokens_processed", 0) for a in summarized),
+                "tokens_dropped": sum(a["tokens"].get("tokens_dropped", 0) for a in summarized),
+            },
+        }
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.status in FINISHED]
+        while len(self.jobs) > self.max_jobs and finished:
+            self.jobs.pop(finished.pop(0), None)
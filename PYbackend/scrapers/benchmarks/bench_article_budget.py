@@ -0,0 +1,90 @@
+"""Wall-clock time of one site's article fetch as the per-request budget grows.
+
+Serves ``fixtures/<site>_article.html`` locally with ``--latency`` ms added
+to every response (to stand in for a remote site), then reads 1, 2, 4, ...
+articles for one site through ``ArticleFetcher``, the way ``scrape_site``
+does, and compares the wall time with reading them one after another.
+
+    cd PYbackend/scrapers
+    python benchmarks/bench_article_budget.py --site devto --engine http --latency 300
+"""
+import os
+import sys
+import time
+import argparse
+import functools
+import threading
+from http.server import ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# PYbackend/, for the modules the services share (common/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from scraper_factory import ScraperFactory
+from article_fetcher import ArticleFetcher
+from bench_http_vs_selenium import FIXTURES, QuietHandler
+
+
+class SlowHandler(QuietHandler):
+    latency = 0.0
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        super().do_GET()
+
+
+def serve_slow_fixtures(latency):
+    handler = functools.partial(type("Handler", (SlowHandler,), {"latency": latency}), directory=FIXTURES)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--site", choices=["devto", "wix"], default="devto")
+    parser.add_argument("--engine", choices=["http", "selenium"], default="http")
+    parser.add_argument("--latency", type=float, default=300, help="ms added to every response")
+    parser.add_argument("--concurrency", type=int, default=3, help="per-site cap")
+    parser.add_argument("--max-articles", type=int, default=8)
+    args = parser.parse_args()
+
+    def get_article(site, url):
+        bot = ScraperFactory.create_scraper(site, engine=args.engine)
+        try:
+            return bot.get_article(url)
+        finally:
+            bot.quit()
+
+    server, base = serve_slow_fixtures(args.latency / 1000)
+    fetcher = ArticleFetcher(get_article, default_limit=args.concurrency)
+    sequential = ArticleFetcher(get_article, default_limit=1)
+    # Distinct URLs per article, so nothing is served from a connection-level cache
+    urls = [f"{base}/{args.site}_article.html?n={i}" for i in range(args.max_articles)]
+    budgets = [1]
+    while budgets[-1] * 2 <= args.max_articles:
+        budgets.append(budgets[-1] * 2)
+
+    print(f"{'articles':>8} {'sequential s':>13} {'concurrent s':>13} {'vs 1 article':>13}")
+    try:
+        sequential.fetch(args.site, urls[:1])  # warm-up: first connection / first render
+        baseline = None
+        for budget in budgets:
+            start = time.perf_counter()
+            sequential.fetch(args.site, urls[:budget])
+            serial = time.perf_counter() - start
+            start = time.perf_counter()
+            articles = fetcher.fetch(args.site, urls[:budget])
+            wall = time.perf_counter() - start
+            baseline = baseline or wall
+            failed = sum("error" in a or not a.get("content", "").strip() for a in articles)
+            note = f"  ({failed} failed)" if failed else ""
+            print(f"{budget:>8} {serial:>13.2f} {wall:>13.2f} {wall / baseline:>12.1f}x{note}")
+    finally:
+        fetcher.shutdown()
+        sequential.shutdown()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""WebDriver round trips and time per article: per-element reads vs one extraction script.
+
+Serves ``fixtures/*.html`` locally and reads each article ``--pages`` times
+with the per-element code the Selenium scrapers used before (``element.text``
+and ``get_attribute`` per tag) and with their current ``get_article``, which
+reads the page through ``WebScraper.extract``. Every command sent to
+chromedriver is counted, including ``get`` and the readiness polls.
+
+    cd PYbackend/scrapers
+    python benchmarks/bench_dom_extraction.py --pages 20
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# PYbackend/, for the modules the services share (common/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from selenium.webdriver.common.by import By
+from scraper_factory import ScraperFactory
+from driver_pool import DriverPool
+from bench_http_vs_selenium import serve_fixtures
+
+
+def count_commands(driver):
+    """Wrap ``driver.execute`` (which WebElement calls go through too) to count round trips."""
+    counter = {"commands": 0}
+    execute = driver.execute
+
+    def counting_execute(command, params=None):
+        counter["commands"] += 1
+        return execute(command, params)
+
+    driver.execute = counting_execute
+    return counter
+
+
+def devto_per_element(scraper, url):
+    scraper.driver.get(url)
+    scraper.wait_for(By.ID, "article-body")
+    article_body = scraper.driver.find_element(By.ID, "article-body")
+    combined_text = []
+    for tag_name in ["p", "h1", "h2", "h3", "a"]:
+        for element in article_body.find_elements(By.TAG_NAME, tag_name):
+            text = element.text.strip()
+            if text:
+                if tag_name == "a":
+                    combined_text.append(f"{text} ({element.get_attribute('href')})")
+                else:
+                    combined_text.append(text)
+    return {"url": url, "content": " ".join(combined_text)}
+
+
+def wix_per_element(scraper, url):
+    scraper.driver.get(url)
+    content = ""
+    for p in scraper.wait_for(By.CSS_SELECTOR, "div.blog-post-content p"):
+        content += p.text + " "
+    return {"url": url, "content": content}
+
+
+PER_ELEMENT = {"devto": devto_per_element, "wix": wix_per_element}
+
+
+def run(name, read, url, pages, counter):
+    read(url)  # warm-up: first render
+    counter["commands"] = 0
+    chars = 0
+    start = time.perf_counter()
+    for _ in range(pages):
+        chars += len(read(url)["content"])
+    elapsed = time.perf_counter() - start
+    print(f"{name:<12} {counter['commands'] / pages:>12.1f} {elapsed / pages * 1000:>10.1f} {chars // pages:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=20, help="articles read per method")
+    args = parser.parse_args()
+
+    server, base = serve_fixtures()
+    pool = DriverPool(size=1)
+    print(f"{'method':<12} {'round trips':>12} {'ms/page':>10} {'chars':>10}")
+    try:
+        for site, per_element in PER_ELEMENT.items():
+            url = f"{base}/{site}_article.html"
+            scraper = ScraperFactory.create_scraper(site, engine="selenium")
+            scraper.pool = pool
+            try:
+                counter = count_commands(scraper.driver)
+                print(f"-- {site}")
+                run("per-element", lambda u: per_element(scraper, u), url, args.pages, counter)
+                run("extract", scraper.get_article, url, args.pages, counter)
+            finally:
+                scraper.quit()
+    finally:
+        pool.shutdown()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Compare the HTTP scraper tier with the Selenium tier on saved HTML fixtures.
+
+Serves ``fixtures/*.html`` from a local HTTP server and reads each article
+``--pages`` times through both tiers, reporting pages/sec and peak RSS (this
+process plus any Chrome/chromedriver children). Linux only (RSS is read from /proc).
+
+    cd PYbackend/scrapers
+    python benchmarks/bench_http_vs_selenium.py --pages 50
+"""
+import os
+import sys
+import time
+import argparse
+import functools
+import threading
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# PYbackend/, for the modules the services share (common/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from scraper_factory import ScraperFactory
+from driver_pool import DriverPool
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_fixtures():
+    handler = functools.partial(QuietHandler, directory=FIXTURES)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def _rss_kb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def _children(pid):
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(c) for c in f.read().split()]
+    except OSError:
+        return []
+
+
+def tree_rss_mb(pid=None):
+    """RSS of a process and all of its descendants, in MB."""
+    pid = pid or os.getpid()
+    total, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        total += _rss_kb(current)
+        stack.extend(_children(current))
+    return total / 1024
+
+
+def run_tier(name, scraper, urls, pages):
+    peak = tree_rss_mb()
+    scraper.get_article(urls[0])  # warm-up: first connection / first render
+    chars = 0
+    start = time.perf_counter()
+    for i in range(pages):
+        article = scraper.get_article(urls[i % len(urls)])
+        chars += len(article["content"])
+        if i % 10 == 0:
+            peak = max(peak, tree_rss_mb())
+    elapsed = time.perf_counter() - start
+    peak = max(peak, tree_rss_mb())
+    print(f"{name:<10} {pages / elapsed:>10.1f} {elapsed / pages * 1000:>10.1f} {peak:>12.1f} {chars // pages:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=30, help="articles read per tier")
+    parser.add_argument("--tier", choices=["http", "selenium", "both"], default="both")
+    args = parser.parse_args()
+
+    server, base = serve_fixtures()
+    print(f"{'tier':<10} {'pages/s':>10} {'ms/page':>10} {'peak RSS MB':>12} {'chars':>10}")
+    try:
+        for site in ["devto", "wix"]:
+            urls = [f"{base}/{site}_article.html"]
+            print(f"-- {site}")
+            if args.tier in ("http", "both"):
+                run_tier("http", ScraperFactory.create_scraper(site, engine="http"), urls, args.pages)
+            if args.tier in ("selenium", "both"):
+                scraper = ScraperFactory.create_scraper(site, engine="selenium")
+                scraper.pool = DriverPool(size=1)
+                try:
+                    run_tier("selenium", scraper, urls, args.pages)
+                finally:
+                    scraper.quit()
+                    scraper.pool.shutdown()
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Latency, throughput, peak RSS and ROUGE of each summarizer backend, side by side.
+
+Summarizes the same chunks of the saved fixture articles with every backend
+in ``--backends``, each in its own process so peak RSS belongs to that
+backend alone, in batches the way the summary batcher sends them. ROUGE-1,
+ROUGE-2 and ROUGE-L (F1) compare each backend's summaries with the
+baseline's on the same chunks, so the baseline always runs and scores 1.0.
+
+    cd PYbackend/scrapers
+    python benchmarks/bench_summarizer_backends.py --backends baseline,int8,distilled,onnx
+
+The onnx backend needs ``pip install optimum[onnxruntime]``; its first run
+includes the export, later runs load it from SUMMARY_ONNX_DIR.
+"""
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# PYbackend/, for the modules the services share (common/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from bench_summary_batcher import load_corpus
+from summary_batcher import _percentile
+
+
+def words(text):
+    return re.findall(r"\w+", text.lower())
+
+
+def _f1(overlap, reference, candidate):
+    if not overlap:
+        return 0.0
+    precision, recall = overlap / candidate, overlap / reference
+    return 2 * precision * recall / (precision + recall)
+
+
+def rouge_n(reference, candidate, n):
+    ref = [tuple(reference[i:i + n]) for i in range(len(reference) - n + 1)]
+    cand = [tuple(candidate[i:i + n]) for i in range(len(candidate) - n + 1)]
+    counts = {}
+    for gram in ref:
+        counts[gram] = counts.get(gram, 0) + 1
+    overlap = 0
+    for gram in cand:
+        if counts.get(gram, 0):
+            counts[gram] -= 1
+            overlap += 1
+    return _f1(overlap, len(ref), len(cand))
+
+
+def rouge_l(reference, candidate):
+    # Longest common subsequence, one row at a time
+    previous = [0] * (len(candidate) + 1)
+    for ref_word in reference:
+        current = [0]
+        for j, cand_word in enumerate(candidate):
+            current.append(previous[j] + 1 if ref_word == cand_word else max(previous[j + 1], current[j]))
+        previous = current
+    return _f1(previous[-1], len(reference), len(candidate))
+
+
+def rouge(references, candidates):
+    scores = {"rouge1": 0.0, "rouge2": 0.0, "rougeL": 0.0}
+    for reference, candidate in zip(references, candidates):
+        reference, candidate = words(reference), words(candidate)
+        scores["rouge1"] += rouge_n(reference, candidate, 1)
+        scores["rouge2"] += rouge_n(reference, candidate, 2)
+        scores["rougeL"] += rouge_l(reference, candidate)
+    return {key: value / len(references) for key, value in scores.items()}
+
+
+def worker(backend, chunks, batch_size, model_dir):
+    """Run one backend over ``chunks`` in this process and return its measurements."""
+    from summarizer_backends import load_summary_backend
+
+    start = time.perf_counter()
+    summarizer = load_summary_backend(backend, model_dir)
+    load_seconds = time.perf_counter() - start
+    summarizer(chunks[0], max_length=30, min_length=5, truncation=True, do_sample=False)  # warm-up
+
+    summaries, latencies = [], []
+    start = time.perf_counter()
+    for i in range(0, len(chunks), batch_size):
+        batch = chunks[i:i + batch_size]
+        batch_start = time.perf_counter()
+        outputs = summarizer(batch, batch_size=len(batch), truncation=True, do_sample=False,
+                             max_length=100, min_length=30)
+        latencies.append(time.perf_counter() - batch_start)
+        summaries.extend((o[0] if isinstance(o, list) else o)["summary_text"] for o in outputs)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "backend": backend,
+        "load_seconds": load_seconds,
+        "batch_p50_ms": _percentile(latencies, 50) * 1000,
+        "batch_p95_ms": _percentile(latencies, 95) * 1000,
+        "chunks_per_second": len(chunks) / elapsed,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,  # KiB on Linux
+        "summaries": summaries,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", default="baseline,int8,distilled,onnx")
+    parser.add_argument("--chunks", type=int, default=16, help="corpus chunks summarized per backend")
+    parser.add_argument("--batch-size", type=int, default=4)
+    parser.add_argument("--model-dir", default="", help="local snapshot to load instead of the hub model")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    chunks = [corpus[i % len(corpus)] for i in range(args.chunks)]
+    if args.worker:
+        print(json.dumps(worker(args.worker, chunks, args.batch_size, args.model_dir)))
+        return
+
+    backends = ["baseline"] + [b for b in args.backends.split(",") if b and b != "baseline"]
+    results = []
+    for backend in backends:
+        command = [sys.executable, os.path.abspath(__file__), "--worker", backend, "--chunks", str(args.chunks),
+                   "--batch-size", str(args.batch_size), "--model-dir", args.model_dir]
+        process = subprocess.run(command, capture_output=True, text=True)
+        if process.returncode != 0:
+            print(f"{backend}: failed\n{process.stderr.strip().splitlines()[-1] if process.stderr else ''}")
+            continue
+        results.append(json.loads(process.stdout.strip().splitlines()[-1]))
+
+    if not results or results[0]["backend"] != "baseline":
+        sys.exit("The baseline backend did not run, so there is nothing to compare against")
+    references = results[0]["summaries"]
+    print(f"{len(chunks)} chunks, batch size {args.batch_size}")
+    print(f"{'backend':<10} {'load s':>7} {'p50 ms':>8} {'p95 ms':>8} {'chunks/s':>9} {'peak MB':>8} "
+          f"{'R-1':>6} {'R-2':>6} {'R-L':>6}")
+    for result in results:
+        scores = rouge(references, result["summaries"])
+        print(f"{result['backend']:<10} {result['load_seconds']:>7.1f} {result['batch_p50_ms']:>8.0f} "
+              f"{result['batch_p95_ms']:>8.0f} {result['chunks_per_second']:>9.2f} {result['peak_rss_mb']:>8.0f} "
+              f"{scores['rouge1']:>6.3f} {scores['rouge2']:>6.3f} {scores['rougeL']:>6.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Throughput and latency of the summary batcher for several batch sizes.
+
+Chunks are cut from the saved article fixtures and submitted by ``--clients``
+concurrent callers, the way several sites/requests hit the batcher at once.
+Reports chunks/sec and p50/p95 per-chunk latency for each ``--batch-sizes``
+value (1 = no batching).
+
+    cd PYbackend/scrapers
+    python benchmarks/bench_summary_batcher.py                      # facebook/bart-large-cnn on CPU
+    python benchmarks/bench_summary_batcher.py --stub               # offline, simulated model cost
+"""
+import os
+import sys
+import time
+import argparse
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# PYbackend/, for the modules the services share (common/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from lxml import html
+from summary_batcher import SummaryBatcher, _percentile
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def load_corpus(chunk_size=1500):
+    """Paragraph text of every fixture article, cut into chunks of about ``chunk_size`` characters."""
+    chunks = []
+    for name in sorted(os.listdir(FIXTURES)):
+        if not name.endswith(".html"):
+            continue
+        with open(os.path.join(FIXTURES, name), "rb") as f:
+            doc = html.fromstring(f.read())
+        text = " ".join(" ".join(p.text_content().split()) for p in doc.iter("p"))
+        chunks.extend(text[i:i + chunk_size] for i in range(0, len(text), chunk_size))
+    return chunks
+
+
+def stub_summarizer(overhead=0.15, per_item=0.05):
+    """Stand-in with a fixed per-call cost plus a smaller per-item cost, like a padded forward pass."""
+    def summarize(texts, batch_size=1, **kwargs):
+        time.sleep(overhead + per_item * len(texts))
+        return [{"summary_text": text[:80]} for text in texts]
+    return summarize
+
+
+def run(summarizer, chunks, clients, batch_size, max_wait_ms):
+    batcher = SummaryBatcher(summarizer, max_batch_size=batch_size, max_wait_ms=max_wait_ms)
+    latencies = []
+    lock = threading.Lock()
+
+    def client(i):
+        futures = [(time.perf_counter(), batcher.submit(chunk, max_length=100, min_length=30))
+                   for chunk in chunks[i::clients]]
+        for submitted, future in futures:
+            future.result()
+            with lock:
+                latencies.append(time.perf_counter() - submitted)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    metrics = batcher.metrics()
+    batcher.shutdown()
+    latencies.sort()
+    print(f"{batch_size:>6} {len(chunks) / elapsed:>12.2f} {_percentile(latencies, 50) * 1000:>10.0f} "
+          f"{_percentile(latencies, 95) * 1000:>10.0f} {metrics['avg_batch_size']:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="facebook/bart-large-cnn")
+    parser.add_argument("--stub", action="store_true", help="use a simulated model instead of transformers")
+    parser.add_argument("--clients", type=int, default=4, help="concurrent callers")
+    parser.add_argument("--chunks", type=int, default=32, help="total chunks to summarize per run")
+    parser.add_argument("--batch-sizes", default="1,4,8")
+    parser.add_argument("--max-wait-ms", type=float, default=30)
+    args = parser.parse_args()
+
+    if args.stub:
+        summarizer = stub_summarizer()
+    else:
+        from transformers import pipeline
+        summarizer = pipeline("summarization", model=args.model)
+        summarizer("warm up " * 50, max_length=30, min_length=5, do_sample=False)
+
+    corpus = load_corpus()
+    chunks = [corpus[i % len(corpus)] for i in range(args.chunks)]
+    print(f"{len(chunks)} chunks, {args.clients} clients, max wait {args.max_wait_ms:.0f} ms")
+    print(f"{'batch':>6} {'chunks/s':>12} {'p50 ms':>10} {'p95 ms':>10} {'avg batch':>10}")
+    for batch_size in [int(b) for b in args.batch_sizes.split(",")]:
+        run(summarizer, chunks, args.clients, batch_size, args.max_wait_ms)
+
+
+if __name__ == "__main__":
+    main()
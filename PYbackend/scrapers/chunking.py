@@ -0,0 +1,92 @@
+import os
+import re
+from typing import Dict, List, Tuple
+
+# Split after sentence-ending punctuation (same rule the TTS service uses)
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+
+CHUNK_MAX_TOKENS = int(os.getenv("SUMMARY_CHUNK_MAX_TOKENS", "0"))  # 0 = the model's own input limit
+CHUNK_OVERLAP_SENTENCES = int(os.getenv("SUMMARY_CHUNK_OVERLAP_SENTENCES", "0"))
+
+# Tokenizers without a configured limit report a huge sentinel value
+_FALLBACK_MAX_TOKENS = 1024
+
+
+def token_budget(tokenizer, max_tokens: int = 0) -> int:
+    """Tokens of text that fit in one forward pass, after the model's special tokens."""
+    limit = tokenizer.model_max_length
+    if not limit or limit > 100_000:
+        limit = _FALLBACK_MAX_TOKENS
+    if max_tokens:
+        limit = min(limit, max_tokens)
+    return limit - tokenizer.num_special_tokens_to_add()
+
+
+def split_sentences(text: str) -> List[str]:
+    return [s for s in SENTENCE_BOUNDARY.split(text.strip()) if s]
+
+
+def chunk_text(text: str, tokenizer, max_tokens: int = CHUNK_MAX_TOKENS,
+               overlap_sentences: int = CHUNK_OVERLAP_SENTENCES) -> Tuple[List[str], Dict]:
+    """Pack whole sentences into as few chunks as fit the summarizer's token budget.
+
+    Sentences longer than the budget on their own are cut at token boundaries.
+    With ``overlap_sentences`` the last sentences of a chunk are repeated at the
+    start of the next one (as long as they use at most half the budget).
+
+    Returns the chunks and token accounting for the request: how many tokens
+    the model will read (``tokens_processed``) and how many it would truncate
+    away (``tokens_dropped``).
+    """
+    budget = token_budget(tokenizer, max_tokens)
+    sentences = split_sentences(text)
+    if not sentences:
+        return [], {"chunks": 0, "token_budget": budget, "tokens_total": 0,
+                    "tokens_processed": 0, "tokens_dropped": 0, "overlap_tokens": 0}
+
+    # One batched tokenizer call; the leading space matches how sentences appear once joined
+    ids = tokenizer([" " + s for s in sentences], add_special_tokens=False)["input_ids"]
+    pieces = []  # (text, token_count) units that each fit the budget
+    for sentence, sentence_ids in zip(sentences, ids):
+        if len(sentence_ids) <= budget:
+            pieces.append((sentence, len(sentence_ids)))
+            continue
+        for i in range(0, len(sentence_ids), budget):
+            window = sentence_ids[i:i + budget]
+            pieces.append((tokenizer.decode(window, skip_special_tokens=True).strip(), len(window)))
+
+    chunks, current, current_tokens, overlap_tokens = [], [], 0, 0
+    for piece, count in pieces:
+        if current and current_tokens + count > budget:
+            chunks.append(" ".join(p for p, _ in current))
+            carried = _overlap(current, overlap_sentences, budget // 2)
+            if carried and sum(c for _, c in carried) + count > budget:
+                carried = []
+            current = carried
+            current_tokens = sum(c for _, c in carried)
+            overlap_tokens += current_tokens
+        current.append((piece, count))
+        current_tokens += count
+    if current:
+        chunks.append(" ".join(p for p, _ in current))
+
+    # Exact accounting on the final chunks (sentence counts are only an estimate once joined)
+    lengths = [len(chunk_ids) for chunk_ids in tokenizer(chunks, add_special_tokens=False)["input_ids"]]
+    processed = sum(min(length, budget) for length in lengths)
+    return chunks, {
+        "chunks": len(chunks),
+        "token_budget": budget,
+        "tokens_total": sum(lengths) - overlap_tokens,
+        "tokens_processed": processed,
+        "tokens_dropped": sum(lengths) - processed,
+        "overlap_tokens": overlap_tokens,
+    }
+
+
+def _overlap(current, overlap_sentences, max_tokens):
+    if overlap_sentences <= 0:
+        return []
+    carried = current[-overlap_sentences:]
+    while carried and sum(c for _, c in carried) > max_tokens:
+        carried = carried[1:]
+    return list(carried)
@@ -0,0 +1,51 @@
+from urllib.parse import quote_plus, urljoin
+import requests
+from http_scraper import HttpScraper
+
+class DevtoHttpScraper(HttpScraper):
+    """HTTP scraper for dev.to: search via the JSON feed, article bodies are server-rendered."""
+    site = "devto"
+    base_url = "https://dev.to"
+
+    def get_links(self, keyword):
+        """Get the first 5 article URLs for a keyword from dev.to's search feed."""
+        url = (f"{self.base_url}/search/feed_content?per_page=5&page=0"
+               f"&search_fields={quote_plus(keyword)}&class_name=Article")
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            results = response.json().get("result", [])
+        except (requests.RequestException, ValueError):
+            return []
+
+        blogs = []
+        for result in results[:5]:
+            path = result.get("path")
+            if path:
+                link = urljoin(self.base_url, path)
+                if link not in blogs:
+                    blogs.append(link)
+        return blogs  # the caller picks how many to read
+
+    def get_article(self, url):
+        doc = self.fetch(url)
+        article = {"url": url, "content": ""}
+        if doc is None:
+            return article
+        bodies = doc.xpath("//*[@id='article-body']")
+        if not bodies:
+            return article
+
+        # Same tag order and link format as DevtoScraper.get_data
+        combined_text = []
+        for tag_name in ["p", "h1", "h2", "h3", "a"]:
+            for element in bodies[0].iter(tag_name):
+                text = " ".join(element.text_content().split())
+                if text:
+                    if tag_name == "a":
+                        href = urljoin(url, element.get("href", ""))
+                        combined_text.append(f"{text} ({href})")
+                    else:
+                        combined_text.append(text)
+        article["content"] = " ".join(combined_text)
+        return article
@@ -1,31 +1,45 @@
-import time
-from selenium.webdriver.common.by import By
 from selenium.common.exceptions import NoSuchElementException
 from scraper import WebScraper
 
 class DevtoScraper(WebScraper):
     """Scraper for dev.to."""
-    
+    site = "devto"
+
     def get_links(self, keyword):
         """Get the first 5 article URLs from dev.to search results."""
-        self.get(f"https://dev.to/search?q={keyword}")
-        time.sleep(5)  # Wait for page to load
+        self.driver.get(f"https://dev.to/search?q={keyword}")
 
         blogs = []
         try:
-            # Find all <h3> elements with class "crayons-story__title"
-            h3_elements = self.find_elements(By.CLASS_NAME, "crayons-story__title")
-            for h3 in h3_elements[:5]:  # Limit to first 5
-                try:
-                    link = h3.find_element(By.TAG_NAME, "a").get_attribute("href")
-                    if link and link not in blogs:
-                        blogs.append(link)
-                except NoSuchElementException:
-                    continue  # Skip if no <a> tag found
+            # Wait for the story titles to render, then read their links in one call
+            titles = self.extract(".crayons-story__title a", wait=True, baseline=5)
+            for title in titles[:5]:  # Limit to first 5
+                link = title["href"]
+                if link and link not in blogs:
+                    blogs.append(link)
         except Exception as e:
             return [{"error": f"Failed to get links: {str(e)}"}]
 
-        return blogs[:1]  # Return up to 5 links
+        return blogs  # Up to 5 links
+
+    def get_article(self, url):
+        """Render one article and return the text of its #article-body ("" if it is empty)."""
+        self.driver.get(url)
+        # Wait for #article-body and read its text and links in the same call
+        tags_to_extract = ["p", "h1", "h2", "h3", "a"]
+        records = self.extract(", ".join(tags_to_extract), root="#article-body", wait=True, baseline=5)
+        records.sort(key=lambda record: tags_to_extract.index(record["tag"]))  # grouped by tag, as before
+
+        combined_text = []
+        for record in records:
+            text = record["text"]
+            if text:
+                if record["tag"] == "a":
+                    combined_text.append(f"{text} ({record['href']})")
+                else:
+                    combined_text.append(text)
+
+        return {"url": url, "content": " ".join(combined_text)}
 
     def get_data(self, keyword):
         """Collect data from the first 5 articles for a given keyword."""
@@ -41,30 +55,9 @@ class DevtoScraper(WebScraper):
             return
 
         for blog in blogs:
-            article = {"url": blog, "content": ""}
             try:
-                self.get(blog)
-                time.sleep(5)  # Wait for article to load
-                
-                # Extract content from #article-body
-                article_body = self.find_element(By.ID, "article-body")
-                tags_to_extract = ["p", "h1", "h2", "h3", "a"]
-                combined_text = []
-
-                for tag_name in tags_to_extract:
-                    elements = article_body.find_elements(By.TAG_NAME, tag_name)
-                    for element in elements:
-                        text = element.text.strip()
-                        if text:
-                            if tag_name == "a":
-                                href = element.get_attribute("href")
-                                combined_text.append(f"{text} ({href})")
-                            else:
-                                combined_text.append(text)
-
-                if combined_text:
-                    article["content"] = " ".join(combined_text)
-                else:
+                article = self.get_article(blog)
+                if not article["content"]:
                     article["content"] = "No content found in article-body"
 
                 self.data.append(article)
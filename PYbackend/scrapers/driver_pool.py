@@ -0,0 +1,217 @@
+import os
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+from common.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Chrome options
+options = webdriver.ChromeOptions()
+options.add_argument("--headless")
+options.add_argument("--disable-gpu")
+options.add_argument("--no-sandbox")
+options.add_argument("--disable-dev-shm-usage")
+options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36")
+
+# Pool settings (override through environment variables)
+POOL_SIZE = int(os.getenv("SCRAPER_POOL_SIZE", "3"))
+POOL_WARM = int(os.getenv("SCRAPER_POOL_WARM", str(POOL_SIZE)))
+POOL_MAX_USES = int(os.getenv("SCRAPER_POOL_MAX_USES", "50"))
+POOL_CHECKOUT_TIMEOUT = float(os.getenv("SCRAPER_POOL_CHECKOUT_TIMEOUT", "60"))
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def create_driver() -> webdriver.Chrome:
+    """Launch a headless Chrome, resolving the chromedriver binary only once per process."""
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            _driver_path = ChromeDriverManager().install()
+    return webdriver.Chrome(service=Service(_driver_path), options=options)
+
+
+class PoolTimeout(Exception):
+    """Raised when no driver becomes available within the checkout timeout."""
+
+
+class DriverPool:
+    """Bounded pool of reusable WebDriver sessions.
+
+    Drivers are created lazily up to ``size``, health-checked on checkout and
+    recycled after ``max_uses`` checkouts so a long-lived Chrome never grows unbounded.
+    """
+
+    def __init__(self, size=POOL_SIZE, max_uses=POOL_MAX_USES, checkout_timeout=POOL_CHECKOUT_TIMEOUT,
+                 factory=create_driver):
+        self.size = size
+        self.max_uses = max_uses
+        self.checkout_timeout = checkout_timeout
+        self.factory = factory
+        self._idle = []  # LIFO so the most recently used (warmest) driver is handed out first
+        self._uses = {}
+        self._created = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self.stats = {"started": 0, "recycled": 0, "unhealthy": 0, "checkouts": 0, "timeouts": 0}
+
+    def warm_up(self, count=POOL_WARM):
+        """Start up to ``count`` drivers ahead of the first request."""
+        count = min(count, self.size)
+        started = 0
+        while True:
+            with self._cond:
+                if self._closed or self._created >= count:
+                    break
+                self._created += 1
+            try:
+                driver = self._new_driver()
+            except Exception as e:
+                with self._cond:
+                    self._created -= 1
+                logger.error(f"Driver warm-up failed: {e}")
+                break
+            with self._cond:
+                self._idle.append(driver)
+                self._cond.notify()
+            started += 1
+        logger.info(f"Driver pool warmed up with {started} driver(s)")
+        return started
+
+    def acquire(self, timeout=None):
+        """Check a healthy driver out of the pool, waiting at most ``timeout`` seconds."""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._cond:
+                while not self._idle and self._created >= self.size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.stats["timeouts"] += 1
+                        raise PoolTimeout(f"No driver available after {timeout:.1f}s (pool size {self.size})")
+                    self._cond.wait(remaining)
+                if self._closed:
+                    raise RuntimeError("Driver pool is shut down")
+                if self._idle:
+                    driver = self._idle.pop()
+                else:
+                    driver = None
+                    self._created += 1
+
+            if driver is None:
+                try:
+                    driver = self._new_driver()
+                except Exception:
+                    with self._cond:
+                        self._created -= 1
+                        self._cond.notify()
+                    raise
+            elif not self._is_healthy(driver):
+                with self._cond:
+                    self.stats["unhealthy"] += 1
+                self._discard(driver)
+                continue
+
+            with self._cond:
+                self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+                self.stats["checkouts"] += 1
+            return driver
+
+    def release(self, driver, discard=False):
+        """Return a driver to the pool, recycling it when it is worn out or broken."""
+        with self._cond:
+            worn_out = self._uses.get(id(driver), 0) >= self.max_uses
+            closed = self._closed
+            if worn_out:
+                self.stats["recycled"] += 1
+        if discard or worn_out or closed or not self._reset(driver):
+            self._discard(driver)
+            return
+        with self._cond:
+            self._idle.append(driver)
+            self._cond.notify()
+
+    @contextmanager
+    def driver(self, timeout=None):
+        """Context manager wrapping ``acquire``/``release``."""
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        except Exception:
+            self.release(driver, discard=not self._is_healthy(driver))
+            raise
+        else:
+            self.release(driver)
+
+    def shutdown(self):
+        """Quit every idle driver; drivers still checked out are quit on release."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for driver in idle:
+            self._discard(driver)
+
+    def status(self):
+        # Counters only change under the condition's lock, so this is one consistent snapshot
+        with self._cond:
+            return {
+                "size": self.size,
+                "open": self._created,
+                "idle": len(self._idle),
+                "in_use": self._created - len(self._idle),
+                "max_uses": self.max_uses,
+                **self.stats,
+            }
+
+    def _new_driver(self):
+        start = time.perf_counter()
+        with span("browser_launch"):
+            driver = self.factory()
+        with self._cond:
+            self.stats["started"] += 1
+        logger.info(f"Started new driver in {time.perf_counter() - start:.2f}s")
+        return driver
+
+    def _discard(self, driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"Error quitting driver: {e}")
+        with self._cond:
+            self._uses.pop(id(driver), None)
+            self._created -= 1
+            self._cond.notify()
+
+    @staticmethod
+    def _is_healthy(driver):
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _reset(driver):
+        """Clear per-scrape state so the next borrower gets a clean browser."""
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+            return True
+        except Exception as e:
+            logger.warning(f"Driver reset failed, discarding: {e}")
+            return False
+
+
+driver_pool = DriverPool()
@@ -0,0 +1,136 @@
+import os
+import logging
+from abc import ABC, abstractmethod
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import html
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36"
+HTTP_TIMEOUT = float(os.getenv("SCRAPER_HTTP_TIMEOUT", "10"))
+HTTP_POOL_SIZE = int(os.getenv("SCRAPER_HTTP_POOL_SIZE", "20"))
+
+
+def create_session() -> requests.Session:
+    """Session with a keep-alive connection pool shared by every HTTP scraper."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_SIZE,
+        pool_maxsize=HTTP_POOL_SIZE,
+        max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT, "Accept-Language": "en-US,en;q=0.9"})
+    return session
+
+
+http_session = create_session()
+
+
+class HttpScraper(ABC):
+    """Lightweight scraper for server-rendered pages: plain HTTP fetch + lxml parsing, no browser."""
+    site = "generic"
+    timeout = HTTP_TIMEOUT
+
+    def __init__(self, session=None):
+        self.session = session or http_session
+        self.data = []
+
+    def fetch(self, url):
+        """Fetch ``url`` and return the parsed document, or None if the page could not be read."""
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            logger.warning(f"HTTP fetch failed for {url}: {e}")
+            return None
+        return html.fromstring(response.content, base_url=response.url)
+
+    def quit(self):
+        """Nothing to release: the HTTP session is shared and kept alive."""
+        pass
+
+    @abstractmethod
+    def get_links(self, keyword):
+        """Abstract method to get blog links for a given keyword."""
+        pass
+
+    @abstractmethod
+    def get_article(self, url):
+        """Abstract method returning ``{"url", "content"}`` for one article ("" when nothing was found)."""
+        pass
+
+    def get_data(self, keyword):
+        self.data = []
+        blogs = self.get_links(keyword)
+        for blog in blogs:
+            self.data.append(self.get_article(blog))
+        if not self.data:
+            self.data = [{"url": "", "content": "No data found for this keyword"}]
+
+
+class FallbackScraper:
+    """HTTP-first scraper that only renders with Selenium what the fast path could not read.
+
+    Links fall back as a whole when the fast path finds none; articles fall back
+    one by one when their fast-path content is empty.
+    """
+
+    def __init__(self, fast, slow_class):
+        self.fast = fast
+        self.slow_class = slow_class
+        self._slow = None
+        self.site = fast.site
+        self.data = []
+        self.fallbacks = 0
+
+    @property
+    def slow(self):
+        # The Selenium scraper only borrows a driver once it is actually used
+        if self._slow is None:
+            self._slow = self.slow_class()
+        return self._slow
+
+    def get_links(self, keyword):
+        links = self.fast.get_links(keyword)
+        if links:
+            return links
+        logger.info(f"{self.site}: no links over HTTP, falling back to Selenium")
+        self.fallbacks += 1
+        return self.slow.get_links(keyword)
+
+    def get_article(self, url):
+        article = self.fast.get_article(url)
+        if article.get("content", "").strip():
+            return article
+        logger.info(f"{self.site}: no content over HTTP for {url}, falling back to Selenium")
+        self.fallbacks += 1
+        return self.slow.get_article(url)
+
+    def get_data(self, keyword):
+        self.data = []
+        try:
+            blogs = self.get_links(keyword)
+        except Exception as e:
+            self.data = [{"url": "", "content": f"Failed to get links: {str(e)}"}]
+            return
+        if not blogs:
+            self.data = [{"url": "", "content": "No links found for this keyword"}]
+            return
+
+        for blog in blogs:
+            try:
+                article = self.get_article(blog)
+                if not article.get("content", "").strip():
+                    article["content"] = "No content found for this article"
+                self.data.append(article)
+            except Exception as e:
+                self.data.append({"url": blog, "content": f"Error: {str(e)}"})
+
+    def quit(self):
+        self.fast.quit()
+        if self._slow is not None:
+            self._slow.quit()
@@ -1,44 +1,65 @@
-import time
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
 from scraper import WebScraper
 
 class MediumScraper(WebScraper):
     """Scraper for Medium.com."""
+    site = "medium"
+    card_selector = "div[data-href^='https://medium.com/']"
+    show_more_xpath = "//button[text()='Show more']"
+    member_only_selector = "button[aria-label='Member-only story']"
+
     def get_links(self, keyword):
-        self.get(f"https://medium.com/search?q={keyword}")
-        self.maximize_window()
-        time.sleep(5)
+        self.driver.get(f"https://medium.com/search?q={keyword}")
+        self.driver.maximize_window()
+        self.wait_for(By.CSS_SELECTOR, self.card_selector, baseline=5)
 
         blogs = []
         previous_count = 0
 
         while len(blogs) < 10:
-            self.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(3)
+            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
 
+            show_more_buttons = self.wait_for(By.XPATH, self.show_more_xpath, timeout=3, baseline=3)
+            if not show_more_buttons:
+                break
+            card_count = len(self.driver.find_elements(By.CSS_SELECTOR, self.card_selector))
             try:
-                show_more_button = self.find_element(By.XPATH, "//button[text()='Show more']")
-                self.execute_script("arguments[0].scrollIntoView(true);", show_more_button)
+                show_more_button = show_more_buttons[0]
+                self.driver.execute_script("arguments[0].scrollIntoView(true);", show_more_button)
                 show_more_button.click()
-                time.sleep(10)
-            except NoSuchElementException:
+            except (NoSuchElementException, StaleElementReferenceException):
                 break
+            # Wait until the click has actually loaded more cards
+            self.wait_until(
+                lambda driver: len(driver.find_elements(By.CSS_SELECTOR, self.card_selector)) > card_count,
+                timeout=10, baseline=10
+            )
 
-            links = self.find_elements(by=By.CSS_SELECTOR, value="div[data-href^='https://medium.com/']")
-            for link in links:
-                try:
-                    link.find_element(by=By.CSS_SELECTOR, value="button[aria-label='Member-only story']")
-                except NoSuchElementException:
-                    blog_url = link.get_attribute("data-href")
-                    if blog_url and blog_url not in blogs:
-                        blogs.append(blog_url)
+            for blog_url in self.free_story_links():
+                if blog_url not in blogs:
+                    blogs.append(blog_url)
 
             if len(blogs) == previous_count:
                 break
             previous_count = len(blogs)
 
-        return blogs[:1]
+        return blogs
+
+    def free_story_links(self):
+        """Story URLs of the cards on the page that are not member-only, read in one call."""
+        cards = self.extract(self.card_selector, attributes=["data-href"], has=[self.member_only_selector])
+        return [card["attrs"]["data-href"] for card in cards
+                if card["attrs"]["data-href"] and not card["has"][self.member_only_selector]]
+
+    def get_article(self, url):
+        """Render one story and return its paragraph text."""
+        self.driver.get(url)
+        content = ""
+        paragraphs = self.extract("[data-selectable-paragraph]", wait=True, baseline=5)
+        for paragraph in paragraphs:
+            content += paragraph["text"] + " "
+        return {"url": url, "content": content}
 
     def get_data(self, keyword):
         # Reset self.data to ensure fresh results
@@ -51,14 +72,8 @@ class MediumScraper(WebScraper):
             return
 
         for blog in blogs:
-            article = {"url": blog, "content": ""}
             try:
-                self.get(blog)
-                time.sleep(5)
-                paragraphs = self.find_elements(By.CSS_SELECTOR, "[data-selectable-paragraph]")
-                for paragraph in paragraphs:
-                    article["content"] += paragraph.text + " "
-                self.data.append(article)
+                self.data.append(self.get_article(blog))
             except Exception as e:
                 self.data.append({"url": blog, "content": f"Error: {str(e)}"})
 
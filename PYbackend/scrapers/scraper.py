@@ -1,23 +1,142 @@
+import os
+import time
+import threading
 from abc import ABC, abstractmethod
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from driver_pool import driver_pool
 
-# Chrome options
-options = webdriver.ChromeOptions()
-options.add_argument("--headless")
-options.add_argument("--disable-gpu")
-options.add_argument("--no-sandbox")
-options.add_argument("--disable-dev-shm-usage")
-options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36")
+# Upper bound for any readiness wait, in seconds (override per call or per scraper)
+WAIT_TIMEOUT = float(os.getenv("SCRAPER_WAIT_TIMEOUT", "15"))
+WAIT_POLL_INTERVAL = float(os.getenv("SCRAPER_WAIT_POLL_INTERVAL", "0.2"))
 
 
-class WebScraper(webdriver.Chrome, ABC):
-    """Abstract parent class for web scraping with Selenium."""
+class WaitStats:
+    """Per-site latency of readiness waits, compared with the fixed sleeps they replaced."""
+
     def __init__(self):
-        super().__init__(service=Service(ChromeDriverManager().install()), options=options)
+        self._lock = threading.Lock()
+        self._sites = {}
+
+    def record(self, site, waited, baseline, timed_out):
+        with self._lock:
+            stats = self._sites.setdefault(site, {
+                "waits": 0, "timeouts": 0, "waited_seconds": 0.0,
+                "baseline_seconds": 0.0, "max_wait_seconds": 0.0,
+            })
+            stats["waits"] += 1
+            stats["timeouts"] += int(timed_out)
+            stats["waited_seconds"] += waited
+            stats["baseline_seconds"] += baseline
+            stats["max_wait_seconds"] = max(stats["max_wait_seconds"], waited)
+
+    def snapshot(self):
+        with self._lock:
+            result = {}
+            for site, stats in self._sites.items():
+                result[site] = {
+                    **stats,
+                    "avg_wait_seconds": stats["waited_seconds"] / stats["waits"],
+                    "saved_seconds": stats["baseline_seconds"] - stats["waited_seconds"],
+                }
+            return result
+
+
+wait_stats = WaitStats()
+
+# Reads every element matching a selector in one round trip. Arguments: selector,
+# root selector (or null for the whole document), attribute names to copy and
+# "has" selectors to test inside each element. Returns null when the root is missing.
+EXTRACT_SCRIPT = """
+const [selector, rootSelector, attributes, has] = arguments;
+const root = rootSelector ? document.querySelector(rootSelector) : document;
+if (!root) return null;
+return Array.from(root.querySelectorAll(selector), el => {
+    const record = {tag: el.tagName.toLowerCase(), text: (el.innerText || "").trim(),
+                    href: el.href || null, attrs: {}, has: {}};
+    for (const name of attributes) record.attrs[name] = el.getAttribute(name);
+    for (const sel of has) record.has[sel] = el.querySelector(sel) !== null;
+    return record;
+});
+"""
+
+
+class WebScraper(ABC):
+    """Abstract parent class for web scraping with Selenium.
+
+    The browser is borrowed from the shared driver pool on first use and handed
+    back by ``quit()``, so scrapers never launch Chrome themselves.
+    """
+    site = "generic"
+    wait_timeout = WAIT_TIMEOUT
+
+    def __init__(self, pool=None):
+        self.pool = pool or driver_pool
+        self._driver = None
         self.data = []
 
+    @property
+    def driver(self):
+        if self._driver is None:
+            self._driver = self.pool.acquire()
+        return self._driver
+
+    def quit(self):
+        """Return the borrowed driver to the pool."""
+        if self._driver is not None:
+            driver, self._driver = self._driver, None
+            self.pool.release(driver)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.quit()
+
+    def wait_until(self, condition, timeout=None, baseline=0.0):
+        """Poll ``condition(driver)`` until it is truthy or ``timeout`` expires.
+
+        ``baseline`` is the fixed sleep this wait replaces and is only used for
+        the saved-time metrics. Returns the condition's value, or None on timeout.
+        """
+        timeout = self.wait_timeout if timeout is None else timeout
+        start = time.perf_counter()
+        try:
+            result = WebDriverWait(self.driver, timeout, poll_frequency=WAIT_POLL_INTERVAL).until(condition)
+        except TimeoutException:
+            result = None
+        wait_stats.record(self.site, time.perf_counter() - start, baseline, timed_out=result is None)
+        return result
+
+    def wait_for(self, by, value, timeout=None, baseline=0.0):
+        """Wait until at least one element matching the locator is present and return the matches."""
+        return self.wait_until(EC.presence_of_all_elements_located((by, value)), timeout, baseline) or []
+
+    def extract(self, selector, root=None, attributes=(), has=(), wait=False, timeout=None, baseline=0.0):
+        """Read every element matching ``selector`` (under ``root``) in a single script call.
+
+        Returns one record per element, in document order: ``tag``, visible
+        ``text``, resolved ``href`` (or None), ``attrs`` for the requested
+        ``attributes`` and ``has``, mapping each selector in ``has`` to whether
+        the element contains a match. With ``wait`` the script itself is polled
+        until ``root`` exists (or, without a root, until something matches), so
+        waiting and reading share their round trips. Raises
+        NoSuchElementException when ``root`` is not on the page.
+        """
+        args = (selector, root, list(attributes), list(has))
+        if wait:
+            def ready(driver):
+                records = driver.execute_script(EXTRACT_SCRIPT, *args)
+                return [records] if records is not None and (root or records) else False
+            found = self.wait_until(ready, timeout, baseline)
+            records = found[0] if found else (None if root else [])
+        else:
+            records = self.driver.execute_script(EXTRACT_SCRIPT, *args)
+        if records is None:
+            raise NoSuchElementException(f"No element matches {root!r}")
+        return records
+
     @abstractmethod
     def get_links(self, keyword):
         """Abstract method to get blog links for a given keyword."""
@@ -26,4 +145,4 @@ class WebScraper(webdriver.Chrome, ABC):
     @abstractmethod
     def get_data(self, keyword):
         """Abstract method to collect data for a given keyword."""
-        pass
\ No newline at end of file
+        pass
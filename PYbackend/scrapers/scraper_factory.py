@@ -1,7 +1,14 @@
+import os
 from scraper import WebScraper
 from medium_scraper import MediumScraper
 from wix_scraper import WixScraper
 from devto_scraper import DevtoScraper
+from http_scraper import FallbackScraper
+from devto_http_scraper import DevtoHttpScraper
+from wix_http_scraper import WixHttpScraper
+
+# "auto": HTTP first with Selenium fallback, "http": HTTP only, "selenium": browser only
+SCRAPER_ENGINE = os.getenv("SCRAPER_ENGINE", "auto")
 
 class ScraperFactory:
     """Factory class to create scraper instances based on site name."""
@@ -10,12 +17,23 @@ class ScraperFactory:
         "wix": WixScraper,
         "devto": DevtoScraper,
     }
+    # Sites whose pages can be read without a browser
+    _http_scrapers = {
+        "wix": WixHttpScraper,
+        "devto": DevtoHttpScraper,
+    }
 
     @staticmethod
-    def create_scraper(site: str) -> WebScraper:
+    def create_scraper(site: str, engine: str = None) -> WebScraper:
         """Create a scraper instance for the given site."""
         site = site.lower()
+        engine = (engine or SCRAPER_ENGINE).lower()
         scraper_class = ScraperFactory._scrapers.get(site)
         if scraper_class is None:
             raise ValueError(f"Unsupported site: {site}. Supported sites: {list(ScraperFactory._scrapers.keys())}")
-        return scraper_class()  # No path argument
\ No newline at end of file
+        http_class = ScraperFactory._http_scrapers.get(site)
+        if engine == "selenium" or http_class is None:
+            return scraper_class()  # No path argument
+        if engine == "http":
+            return http_class()
+        return FallbackScraper(http_class(), scraper_class)
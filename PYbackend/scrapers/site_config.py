@@ -0,0 +1,21 @@
+from typing import Dict
+
+
+def parse_site_limits(spec: str) -> Dict[str, int]:
+    """Per-site concurrency limits from a spec such as "medium=2,devto=6"; each limit is at least 1."""
+    limits = {}
+    for part in spec.split(","):
+        if "=" in part:
+            site, limit = part.split("=", 1)
+            limits[site.strip().lower()] = max(1, int(limit))
+    return limits
+
+
+def parse_site_seconds(spec: str) -> Dict[str, float]:
+    """Per-site durations in seconds from a spec such as "medium=86400,devto=3600.5"; negative values become 0."""
+    seconds = {}
+    for part in spec.split(","):
+        if "=" in part:
+            site, value = part.split("=", 1)
+            seconds[site.strip().lower()] = max(0.0, float(value))
+    return seconds
@@ -0,0 +1,78 @@
+import os
+import logging
+from transformers import AutoModelForSeq2SeqLM, AutoTokenizer, pipeline
+
+logger = logging.getLogger(__name__)
+
+# "baseline": fp32 BART, "int8": the same weights with dynamically quantized Linear layers,
+# "distilled": DistilBART (12 encoder / 6 decoder layers), "onnx": BART exported to ONNX Runtime
+SUMMARY_BACKEND = os.getenv("SUMMARY_BACKEND", "baseline")
+BACKEND_MODELS = {
+    "baseline": "facebook/bart-large-cnn",
+    "int8": "facebook/bart-large-cnn",
+    "distilled": "sshleifer/distilbart-cnn-12-6",
+    "onnx": "facebook/bart-large-cnn",
+}
+# ONNX exports are written here once and loaded from here on later starts
+SUMMARY_ONNX_DIR = os.getenv("SUMMARY_ONNX_DIR", "models/onnx")
+
+
+def summary_model_id(backend: str = SUMMARY_BACKEND, model_dir: str = "") -> str:
+    """Name of the model a backend runs; different backends give different summaries, so caches key on it.
+
+    A local ``model_dir`` may hold any checkpoint (a fine-tune, another
+    revision), so its resolved path becomes part of the id.
+    """
+    if backend not in BACKEND_MODELS:
+        raise ValueError(f"Unknown summary backend {backend}; choose from {list(BACKEND_MODELS)}")
+    model = BACKEND_MODELS[backend]
+    model_id = model if backend == "baseline" else f"{model}#{backend}"
+    return f"{model_id}@{os.path.realpath(model_dir)}" if model_dir else model_id
+
+
+def load_summary_backend(backend: str = SUMMARY_BACKEND, model_dir: str = ""):
+    """Summarization pipeline for ``backend``, loaded from ``model_dir`` when it holds a local snapshot.
+
+    Every backend returns a transformers pipeline, so the batcher, the
+    chunker (``.tokenizer``) and the caches work the same on all of them.
+    """
+    summary_model_id(backend)  # rejects unknown backends
+    source = model_dir or BACKEND_MODELS[backend]
+    logger.info(f"Loading {backend} summarizer from {source}")
+    if backend == "int8":
+        return _load_int8(source)
+    if backend == "onnx":
+        return _load_onnx(source)
+    return pipeline("summarization", model=source)
+
+
+def _load_int8(source):
+    import torch
+    tokenizer = AutoTokenizer.from_pretrained(source)
+    model = AutoModelForSeq2SeqLM.from_pretrained(source)
+    # Weights of every Linear layer become int8; activations are quantized on the fly per batch
+    model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return pipeline("summarization", model=model, tokenizer=tokenizer)
+
+
+def _load_onnx(source):
+    try:
+        import onnxruntime
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    except ImportError as e:
+        raise RuntimeError("SUMMARY_BACKEND=onnx needs optimum with ONNX Runtime: "
+                           "pip install optimum[onnxruntime]") from e
+    export_dir = os.path.join(SUMMARY_ONNX_DIR, source.strip("/").replace("/", "--"))
+    options = onnxruntime.SessionOptions()
+    options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if os.path.isdir(export_dir) and any(name.endswith(".onnx") for name in os.listdir(export_dir)):
+        model = ORTModelForSeq2SeqLM.from_pretrained(export_dir, session_options=options)
+        tokenizer = AutoTokenizer.from_pretrained(export_dir)
+    else:
+        # First start: export the graphs and keep them, so later starts skip the export
+        logger.info(f"Exporting {source} to ONNX in {export_dir}")
+        model = ORTModelForSeq2SeqLM.from_pretrained(source, export=True, session_options=options)
+        tokenizer = AutoTokenizer.from_pretrained(source)
+        model.save_pretrained(export_dir)
+        tokenizer.save_pretrained(export_dir)
+    return pipeline("summarization", model=model, tokenizer=tokenizer)
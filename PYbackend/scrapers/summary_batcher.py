@@ -0,0 +1,156 @@
+import os
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future
+from common.tracing import record
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_SIZE = int(os.getenv("SUMMARY_MAX_BATCH_SIZE", "8"))
+MAX_WAIT_MS = float(os.getenv("SUMMARY_MAX_WAIT_MS", "30"))
+
+
+class _Pending:
+    __slots__ = ("text", "key", "future", "enqueued")
+
+    def __init__(self, text, key):
+        self.text = text
+        self.key = key
+        self.future = Future()
+        self.enqueued = time.perf_counter()
+
+
+class SummaryBatcher:
+    """Collects chunks from every site and request into dynamic batches for one forward pass each.
+
+    A single worker thread owns the model, so torch's intra-op thread pool is
+    used by one batched call at a time instead of being fought over by many
+    threads. A batch is flushed when it reaches ``max_batch_size`` or when its
+    oldest chunk has waited ``max_wait_ms``. Chunks are only batched with
+    chunks that use the same generation arguments.
+    """
+
+    def __init__(self, summarizer, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS):
+        self.summarizer = summarizer
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self._pending = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._worker = None
+        self._latencies = deque(maxlen=2048)
+        self.stats = {"chunks": 0, "batches": 0, "errors": 0, "busy_seconds": 0.0}
+
+    def submit(self, text: str, **generate_kwargs) -> Future:
+        """Queue one chunk; the returned future resolves to its summary text."""
+        item = _Pending(text, tuple(sorted(generate_kwargs.items())))
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Summary batcher is shut down")
+            self._ensure_worker()
+            self._pending.append(item)
+            self._cond.notify()
+        return item.future
+
+    def summarize(self, text: str, **generate_kwargs) -> str:
+        return self.submit(text, **generate_kwargs).result()
+
+    def summarize_many(self, texts, **generate_kwargs):
+        futures = [self.submit(text, **generate_kwargs) for text in texts]
+        return [future.result() for future in futures]
+
+    def shutdown(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._worker is not None:
+            self._worker.join()
+
+    def metrics(self):
+        with self._cond:
+            latencies = sorted(self._latencies)
+            stats = dict(self.stats)
+            queued = len(self._pending)
+        busy = stats.pop("busy_seconds")
+        return {
+            **stats,
+            "queued": queued,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "avg_batch_size": stats["chunks"] / stats["batches"] if stats["batches"] else 0.0,
+            "chunks_per_busy_second": stats["chunks"] / busy if busy else 0.0,
+            "latency_p50_ms": _percentile(latencies, 50) * 1000,
+            "latency_p95_ms": _percentile(latencies, 95) * 1000,
+        }
+
+    def _ensure_worker(self):
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, name="summary-batcher", daemon=True)
+            self._worker.start()
+
+    def _next_batch(self):
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            if not self._pending:
+                return None
+            # Wait for the batch to fill up, but never past the oldest chunk's deadline
+            deadline = self._pending[0].enqueued + self.max_wait
+            while len(self._pending) < self.max_batch_size and not self._closed:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            key = self._pending[0].key
+            batch, rest = [], deque()
+            while self._pending:
+                item = self._pending.popleft()
+                if item.key == key and len(batch) < self.max_batch_size:
+                    batch.append(item)
+                else:
+                    rest.append(item)
+            self._pending = rest
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            start = time.perf_counter()
+            try:
+                outputs = self.summarizer(
+                    [item.text for item in batch],
+                    batch_size=len(batch),
+                    truncation=True,
+                    do_sample=False,
+                    **dict(batch[0].key)
+                )
+            except Exception as e:
+                logger.error(f"Batched summarization failed for {len(batch)} chunk(s): {e}")
+                with self._cond:
+                    self.stats["errors"] += 1
+                for item in batch:
+                    item.future.set_exception(e)
+                continue
+            done = time.perf_counter()
+            # One forward pass serves chunks of many requests, so it is only counted in the histogram
+            record("inference", done - start)
+            with self._cond:
+                self.stats["batches"] += 1
+                self.stats["chunks"] += len(batch)
+                self.stats["busy_seconds"] += done - start
+                self._latencies.extend(done - item.enqueued for item in batch)
+            for item, output in zip(batch, outputs):
+                if isinstance(output, list):
+                    output = output[0]
+                item.future.set_result(output["summary_text"])
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, round(pct / 100 * (len(sorted_values) - 1)))
+    return sorted_values[index]
@@ -0,0 +1,162 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+CACHE_DB = os.getenv("SUMMARY_CACHE_DB", "")  # e.g. "summary_cache.sqlite3"; empty keeps caches in memory only
+CHUNK_CACHE_SIZE = int(os.getenv("SUMMARY_CHUNK_CACHE_SIZE", "10000"))
+RESULT_CACHE_SIZE = int(os.getenv("SUMMARY_RESULT_CACHE_SIZE", "500"))
+RESULT_CACHE_TTL = float(os.getenv("SUMMARY_RESULT_CACHE_TTL", "3600"))
+DISK_CACHE_FACTOR = 10  # the SQLite table may hold this many times the in-memory entries
+
+_MISSING = object()
+_EXPIRED = object()
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.split())
+
+
+def content_key(*parts) -> str:
+    """Stable hash of the normalized parts, used as a cache key."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(normalize_text(str(part)).encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class SummaryCache:
+    """Thread-safe LRU cache with an optional TTL and an optional SQLite backing table.
+
+    The in-memory layer holds at most ``max_entries`` values. With a database
+    path every write goes through to SQLite, misses are looked up there and
+    promoted, and the table is pruned (least recently used first) to
+    ``max_entries * DISK_CACHE_FACTOR`` rows, so the cache survives restarts.
+    Values must be JSON-serializable.
+    """
+
+    def __init__(self, name, max_entries, ttl=None, db_path=CACHE_DB):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (value, expires_at)
+        self._lock = threading.Lock()
+        self._db = None
+        self.stats = {"hits": 0, "misses": 0, "disk_hits": 0, "evictions": 0, "expirations": 0, "sets": 0}
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache (name TEXT, key TEXT, value TEXT, expires_at REAL, "
+                "last_access REAL, PRIMARY KEY (name, key))"
+            )
+            self._db.commit()
+
+    def get(self, key, default=None):
+        now = time.time()
+        with self._lock:
+            value = self._get_memory(key, now)
+            if self._db is not None:
+                if value is _MISSING:
+                    value = self._get_disk(key, now)
+                elif value is _EXPIRED:
+                    self._db.execute("DELETE FROM cache WHERE name = ? AND key = ?", (self.name, key))
+                    self._db.commit()
+            if value is _MISSING or value is _EXPIRED:
+                self.stats["misses"] += 1
+                return default
+            self.stats["hits"] += 1
+            return value
+
+    def set(self, key, value):
+        expires_at = time.time() + self.ttl if self.ttl else None
+        with self._lock:
+            self._put_memory(key, value, expires_at)
+            self.stats["sets"] += 1
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO cache (name, key, value, expires_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                    (self.name, key, json.dumps(value), expires_at, time.time())
+                )
+                self._prune_disk()
+                self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM cache WHERE name = ?", (self.name,))
+                self._db.commit()
+
+    def metrics(self):
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+                "persistent": self._db is not None,
+            }
+
+    def _get_memory(self, key, now):
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= now:
+            del self._entries[key]
+            self.stats["expirations"] += 1
+            return _EXPIRED
+        self._entries.move_to_end(key)
+        return value
+
+    def _get_disk(self, key, now):
+        row = self._db.execute(
+            "SELECT value, expires_at FROM cache WHERE name = ? AND key = ?", (self.name, key)
+        ).fetchone()
+        if row is None:
+            return _MISSING
+        value, expires_at = row
+        if expires_at is not None and expires_at <= now:
+            self._db.execute("DELETE FROM cache WHERE name = ? AND key = ?", (self.name, key))
+            self._db.commit()
+            self.stats["expirations"] += 1
+            return _MISSING
+        self._db.execute("UPDATE cache SET last_access = ? WHERE name = ? AND key = ?", (now, self.name, key))
+        self._db.commit()
+        value = json.loads(value)
+        self._put_memory(key, value, expires_at)
+        self.stats["disk_hits"] += 1
+        return value
+
+    def _put_memory(self, key, value, expires_at):
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def _prune_disk(self):
+        limit = self.max_entries * DISK_CACHE_FACTOR
+        (count,) = self._db.execute("SELECT COUNT(*) FROM cache WHERE name = ?", (self.name,)).fetchone()
+        if count > limit:
+            self._db.execute(
+                "DELETE FROM cache WHERE name = ? AND key IN "
+                "(SELECT key FROM cache WHERE name = ? ORDER BY last_access LIMIT ?)",
+                (self.name, self.name, count - limit)
+            )
+
+
+# Summaries of individual chunks, keyed on the normalized chunk text and generation settings
+chunk_cache = SummaryCache("chunks", CHUNK_CACHE_SIZE)
+# Whole per-site results, keyed on keyword + site, expiring after RESULT_CACHE_TTL seconds
+result_cache = SummaryCache("results", RESULT_CACHE_SIZE, ttl=RESULT_CACHE_TTL)
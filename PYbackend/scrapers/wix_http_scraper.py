@@ -0,0 +1,33 @@
+from urllib.parse import quote_plus, urljoin
+from http_scraper import HttpScraper
+
+class WixHttpScraper(HttpScraper):
+    """HTTP scraper for Wix Blog posts, which are server-rendered."""
+    site = "wix"
+    base_url = "https://www.wix.com"
+
+    def get_links(self, keyword):
+        # The search page is mostly client-rendered; an empty result sends FallbackScraper to Selenium
+        doc = self.fetch(f"{self.base_url}/blog/search-results?q={quote_plus(keyword)}")
+        if doc is None:
+            return []
+        blogs = []
+        for link in doc.cssselect("a[data-hook='item-title']"):
+            href = link.get("href")
+            if href:
+                href = urljoin(self.base_url, href)
+                if href not in blogs:
+                    blogs.append(href)
+            if len(blogs) >= 10:
+                break
+        return blogs  # the caller picks how many to read
+
+    def get_article(self, url):
+        doc = self.fetch(url)
+        content = ""
+        if doc is not None:
+            for p in doc.cssselect("div.blog-post-content p"):
+                text = " ".join(p.text_content().split())
+                if text:
+                    content += text + " "
+        return {"url": url, "content": content}
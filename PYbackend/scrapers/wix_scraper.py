@@ -1,22 +1,19 @@
-import time
-from selenium.webdriver.common.by import By
-from selenium.common.exceptions import NoSuchElementException
 from scraper import WebScraper
 
 class WixScraper(WebScraper):
     """Scraper for Wix Blog."""
-    
+    site = "wix"
+
     def get_links(self, keyword):
-        self.get(f"https://www.wix.com/blog/search-results?q={keyword}")
-        self.maximize_window()
-        time.sleep(5)
+        self.driver.get(f"https://www.wix.com/blog/search-results?q={keyword}")
+        self.driver.maximize_window()
 
         blogs = []
 
         try:
-            link_elements = self.find_elements(By.CSS_SELECTOR, "a[data-hook='item-title']")
-            for link in link_elements:
-                href = link.get_attribute("href")
+            titles = self.extract("a[data-hook='item-title']", wait=True, baseline=5)
+            for title in titles:
+                href = title["href"]
                 if href and href not in blogs:
                     blogs.append(href)
                 if len(blogs) >= 10:
@@ -24,7 +21,16 @@ class WixScraper(WebScraper):
         except Exception as e:
             print("❌ Failed to get Wix links:", str(e))
 
-        return blogs[:1]  # return only first blog like MediumScraper
+        return blogs
+
+    def get_article(self, url):
+        """Render one blog post and return its paragraph text ("" if none were found)."""
+        self.driver.get(url)
+        content = ""
+        paragraphs = self.extract("div.blog-post-content p", wait=True, baseline=5)
+        for p in paragraphs:
+            content += p["text"] + " "
+        return {"url": url, "content": content}
 
     def get_data(self, keyword):
         self.data = []
@@ -36,15 +42,8 @@ class WixScraper(WebScraper):
             return
 
         for blog in blogs:
-            article = {"url": blog, "content": ""}
             try:
-                self.get(blog)
-                time.sleep(5)
-
-                paragraphs = self.find_elements(By.CSS_SELECTOR, "div.blog-post-content p")
-                for p in paragraphs:
-                    article["content"] += p.text + " "
-
+                article = self.get_article(blog)
                 if not article["content"].strip():
                     article["content"] = "No content found in blog-post-content"
 